@@ -1,17 +1,22 @@
 import logging
+from collections.abc import Callable, Mapping
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers import aiohttp_client
 from homeassistant.const import Platform
-from homeassistant.exceptions import ConfigEntryAuthFailed
 
-from .api import Mazda6EApi
+from .account import (
+    async_acquire_account,
+    async_get_account,
+    async_release_account,
+    async_remove_status_cache,
+)
 from .const import DOMAIN
-from .coordinator import Mazda6eCoordinator
 
 PLATFORMS = [
     Platform.BINARY_SENSOR,
+    Platform.DEVICE_TRACKER,
     Platform.SENSOR,
 ]
 
@@ -22,34 +27,53 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
     _LOGGER.info("Setting up Mazda 6E integration")
     _LOGGER.info("config_entry: %s", config_entry.data)
 
-    mazda6e_api = Mazda6EApi(
-        aiohttp_client.async_get_clientsession(hass),
-        config_entry.data["token"],
-        config_entry.data["refresh"],
-        config_entry.data["deviceid"],
+    # entries of the same login share one API client and coordinator
+    account = await async_acquire_account(hass, config_entry)
+
+    hass.data.setdefault(DOMAIN, {})[config_entry.entry_id] = account.coordinator
+
+    # tuning options are applied to the running coordinator, no reload needed
+    account.coordinator.async_apply_options(config_entry.options)
+    config_entry.async_on_unload(
+        config_entry.add_update_listener(_options_update_listener(config_entry.options))
     )
 
-    coordinator = Mazda6eCoordinator(hass, config_entry, mazda6e_api)
+    # one entry per login sets up the entities, they would have the same unique ids
+    if account.platform_entry_id == config_entry.entry_id:
+        await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
 
-    try:
-        await coordinator.async_config_entry_first_refresh()
-    except Exception as err:
-        if getattr(err, "status", None) in (401, 403):
-            _LOGGER.warning("Authentication failed: %s – triggering reauth", err)
-            raise ConfigEntryAuthFailed from err
+    return True
 
-        raise
 
-    hass.data.setdefault(DOMAIN, {})[config_entry.entry_id] = coordinator
+def _options_update_listener(options: Mapping[str, Any]) -> Callable:
+    """Apply changed options, the listener is also called when refreshed tokens are saved."""
+    applied = dict(options)
 
-    await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
+    async def _async_update_listener(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+        nonlocal applied
 
-    return True
+        coordinator = hass.data[DOMAIN].get(config_entry.entry_id)
+        if coordinator is None or config_entry.options == applied:
+            return
+
+        applied = dict(config_entry.options)
+        coordinator.async_apply_options(applied)
+        # picks up the new poll interval, vehicles that are not due are not fetched
+        await coordinator.async_request_refresh()
+
+    return _async_update_listener
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    account = async_get_account(hass, entry)
+    if account is not None and account.platform_entry_id == entry.entry_id:
+        await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     hass.data[DOMAIN].pop(entry.entry_id)
+    await async_release_account(hass, entry)
 
     return True
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await async_remove_status_cache(hass, entry)
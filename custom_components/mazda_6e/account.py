@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass, field
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
+from homeassistant.helpers import aiohttp_client
+from homeassistant.helpers.debounce import Debouncer
+
+from .api import Mazda6EApi
+from .const import DOMAIN, TOKEN_SAVE_DELAY
+from .coordinator import Mazda6eCoordinator
+from .store import StatusCache
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_ACCOUNTS = "accounts"
+DATA_ACCOUNTS_LOCK = "accounts_lock"
+
+
+@dataclass
+class Mazda6eAccount:
+    """API client and coordinator shared by all config entries of one login."""
+    key: str
+    api: Mazda6EApi
+    coordinator: Mazda6eCoordinator
+    status_cache: StatusCache
+    token_debouncer: Debouncer | None = None
+    entry_ids: set[str] = field(default_factory=set)
+    # the entry that sets up the entities, the other entries of the login share them
+    platform_entry_id: str | None = None
+    # tokens last written to the config entries
+    persisted: dict[str, str] = field(default_factory=dict)
+    unsub_listeners: list[CALLBACK_TYPE] = field(default_factory=list)
+
+
+def account_key(data: dict) -> str:
+    """Hash identifying the Mazda login of a config entry."""
+    return hashlib.sha256(f"{data['deviceid']}:{data.get('email_enc')}".encode()).hexdigest()
+
+
+async def async_acquire_account(hass: HomeAssistant, config_entry: ConfigEntry) -> Mazda6eAccount:
+    """Return the account of the config entry, creating and refreshing it if needed."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    accounts: dict[str, Mazda6eAccount] = domain_data.setdefault(DATA_ACCOUNTS, {})
+    lock: asyncio.Lock = domain_data.setdefault(DATA_ACCOUNTS_LOCK, asyncio.Lock())
+
+    key = account_key(config_entry.data)
+
+    async with lock:
+        account = accounts.get(key)
+
+        if account is not None:
+            _LOGGER.debug("Sharing Mazda account with entries %s", account.entry_ids)
+            account.entry_ids.add(config_entry.entry_id)
+
+            # the entry was re-authenticated, its tokens replace the rejected ones
+            if isinstance(account.coordinator.last_exception, ConfigEntryAuthFailed):
+                _async_adopt_tokens(account, config_entry)
+                await _async_first_refresh(account.coordinator)
+
+            # the entry setting up the entities was unloaded, this entry takes over
+            if account.platform_entry_id is None:
+                account.platform_entry_id = config_entry.entry_id
+            return account
+
+        account = _create_account(hass, config_entry, key)
+        # registered before the first refresh, so tokens it rotates are saved to the entry
+        account.entry_ids.add(config_entry.entry_id)
+
+        if cached := await account.status_cache.async_load():
+            # entities start with the cached values, the cloud is asked in the background
+            _LOGGER.debug("Starting with the cached status of vehicles %s", list(cached))
+            account.coordinator.data = cached
+            for vehicle_id, entry in cached.items():
+                if entry["charging_session"] is not None:
+                    account.coordinator.charging_sessions.restore(vehicle_id, entry["charging_session"])
+            hass.async_create_background_task(
+                account.coordinator.async_refresh(), f"{DOMAIN} initial refresh"
+            )
+        else:
+            try:
+                await _async_first_refresh(account.coordinator)
+            except ConfigEntryNotReady:
+                # the account is dropped, a rotated refresh token must survive the setup retry
+                _async_save_tokens(hass, account)
+                await _async_discard_account(account)
+                raise
+            except ConfigEntryAuthFailed:
+                await _async_discard_account(account)
+                raise
+
+        account.platform_entry_id = config_entry.entry_id
+        account.unsub_listeners = [
+            account.coordinator.async_add_listener(_auth_failure_listener(hass, account)),
+            account.coordinator.async_add_listener(_status_cache_listener(account)),
+        ]
+        accounts[key] = account
+        return account
+
+
+async def async_release_account(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Drop the entry from its account, shutting the account down with its last entry."""
+    account = async_get_account(hass, config_entry)
+    if account is None:
+        return
+
+    account.entry_ids.discard(config_entry.entry_id)
+    if account.entry_ids:
+        if account.platform_entry_id == config_entry.entry_id:
+            # the next entry of the login is reloaded to set the entities up again
+            account.platform_entry_id = None
+            hass.config_entries.async_schedule_reload(next(iter(account.entry_ids)))
+        return
+
+    # write pending tokens before the debouncer is gone, unless they were rejected
+    if not isinstance(account.coordinator.last_exception, ConfigEntryAuthFailed):
+        _async_save_tokens(hass, account, config_entry)
+
+    await _async_discard_account(account)
+    del hass.data[DOMAIN][DATA_ACCOUNTS][account.key]
+
+
+@callback
+def async_get_account(hass: HomeAssistant, config_entry: ConfigEntry) -> Mazda6eAccount | None:
+    """Return the account the entry was added to, None if the entry is not set up."""
+    accounts: dict[str, Mazda6eAccount] = hass.data.get(DOMAIN, {}).get(DATA_ACCOUNTS, {})
+
+    # looked up by entry id, a reauth may have changed the login data of the entry
+    return next(
+        (account for account in accounts.values() if config_entry.entry_id in account.entry_ids),
+        None,
+    )
+
+
+async def async_remove_status_cache(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Delete the cached status of a removed entry unless another entry shares its login."""
+    key = account_key(config_entry.data)
+
+    if any(
+        account_key(entry.data) == key
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.entry_id != config_entry.entry_id
+    ):
+        return
+
+    await StatusCache(hass, key).async_remove()
+
+
+def _create_account(hass: HomeAssistant, config_entry: ConfigEntry, key: str) -> Mazda6eAccount:
+    api = Mazda6EApi(
+        aiohttp_client.async_get_clientsession(hass),
+        config_entry.data["token"],
+        config_entry.data["refresh"],
+        config_entry.data["deviceid"],
+    )
+
+    # shared by several entries, so not bound to a single config entry
+    coordinator = Mazda6eCoordinator(hass, None, api)
+
+    account = Mazda6eAccount(
+        key=key,
+        api=api,
+        coordinator=coordinator,
+        status_cache=StatusCache(hass, key),
+        persisted={"token": api.token, "refresh": api.refresh},
+    )
+
+    @callback
+    def _async_save_account_tokens() -> None:
+        _async_save_tokens(hass, account)
+
+    account.token_debouncer = Debouncer(
+        hass,
+        _LOGGER,
+        cooldown=TOKEN_SAVE_DELAY,
+        immediate=False,
+        function=_async_save_account_tokens,
+    )
+    api.token_update_callback = lambda token, refresh: hass.async_create_task(
+        account.token_debouncer.async_call()
+    )
+
+    return account
+
+
+async def _async_discard_account(account: Mazda6eAccount) -> None:
+    for unsub in account.unsub_listeners:
+        unsub()
+    account.token_debouncer.async_shutdown()
+    await account.coordinator.async_shutdown()
+
+
+async def _async_first_refresh(coordinator: Mazda6eCoordinator) -> None:
+    """Refresh the coordinator, failing the entry setup like async_config_entry_first_refresh."""
+    await coordinator.async_refresh()
+
+    if coordinator.last_update_success:
+        return
+
+    err = coordinator.last_exception
+    if isinstance(err, ConfigEntryAuthFailed):
+        raise err
+
+    if getattr(err, "status", None) in (401, 403):
+        _LOGGER.warning("Authentication failed: %s – triggering reauth", err)
+        raise ConfigEntryAuthFailed from err
+
+    raise ConfigEntryNotReady from err
+
+
+@callback
+def _async_adopt_tokens(account: Mazda6eAccount, config_entry: ConfigEntry) -> None:
+    account.api.token = config_entry.data["token"]
+    account.api.refresh = config_entry.data["refresh"]
+    account.persisted.update(token=account.api.token, refresh=account.api.refresh)
+    account.coordinator.invalidate_vehicles()
+
+
+@callback
+def _async_save_tokens(hass: HomeAssistant, account: Mazda6eAccount, *extra_entries: ConfigEntry) -> None:
+    """write rotated tokens to all entries of the account, so a restart starts with a valid token"""
+    api = account.api
+    if account.persisted == {"token": api.token, "refresh": api.refresh}:
+        return
+
+    _LOGGER.debug("Persisting refreshed tokens")
+    account.persisted.update(token=api.token, refresh=api.refresh)
+
+    entries = {
+        entry.entry_id: entry
+        for entry_id in account.entry_ids
+        if (entry := hass.config_entries.async_get_entry(entry_id)) is not None
+    }
+    entries.update({entry.entry_id: entry for entry in extra_entries})
+
+    for entry in entries.values():
+        hass.config_entries.async_update_entry(
+            entry,
+            data={**entry.data, **account.persisted},
+        )
+
+
+def _auth_failure_listener(hass: HomeAssistant, account: Mazda6eAccount) -> CALLBACK_TYPE:
+    """Start reauth of all entries when the shared coordinator is rejected."""
+
+    @callback
+    def _async_check_auth() -> None:
+        if account.coordinator.last_update_success:
+            return
+        if not isinstance(account.coordinator.last_exception, ConfigEntryAuthFailed):
+            return
+
+        for entry_id in account.entry_ids:
+            if (entry := hass.config_entries.async_get_entry(entry_id)) is not None:
+                entry.async_start_reauth(hass)
+
+    return _async_check_auth
+
+
+def _status_cache_listener(account: Mazda6eAccount) -> CALLBACK_TYPE:
+    """Write successfully refreshed data to the status cache."""
+
+    @callback
+    def _async_save_status() -> None:
+        if account.coordinator.last_update_success and account.coordinator.data:
+            account.status_cache.async_schedule_save(account.coordinator.data)
+
+    return _async_save_status
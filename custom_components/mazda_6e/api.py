@@ -1,10 +1,31 @@
 import aiohttp
+import asyncio
+import base64
+import json
+import random
 import time
 import logging
-
-from .const import PUB_KEY, DEVICE_NAME
+from typing import Callable
+
+from .const import (
+    PUB_KEY,
+    DEVICE_NAME,
+    REQUEST_TIMEOUT,
+    REQUEST_RETRIES,
+    RETRY_BACKOFF,
+    CIRCUIT_BREAKER_THRESHOLD,
+    CIRCUIT_BREAKER_COOLDOWN,
+    MAX_RESPONSE_SIZE,
+    RATE_LIMIT,
+    RATE_LIMIT_BURST,
+    THROTTLE_PAUSE,
+)
+from .helpers.circuit_breaker import CircuitBreaker
+from .helpers.metrics import Metrics
+from .helpers.rate_limiter import PRIORITY_POLL, PRIORITY_USER, RateLimiter
 from .models import Mazda6eVehicle
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.util.json import json_loads_object
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,21 +44,213 @@ HEADERS_BASE = {
 }
 
 
+# all blocks known by condition/v2, in request order
+VEHICLE_CRITERIA = (
+    "seat",
+    "tire",
+    "charge",
+    "vehicleStatus",
+    "hvac",
+    "departurePlan",
+    "fuel",
+    "window",
+    "door",
+    "airConditionPlan",
+    "lamp",
+    "warmCoolingBox",
+    "welcome",
+    "location",
+)
+
+# blocks requested when no selection is given
+STATUS_BLOCKS = ("seat", "tire", "charge", "vehicleStatus", "hvac", "window", "door", "lamp", "location")
+
+# refresh the token this many seconds before it expires
+TOKEN_REFRESH_MARGIN = 5 * 60
+
+
+class Mazda6eApiError(Exception):
+    """Request to the Mazda API failed."""
+
+    def __init__(self, message: str, code: str | None = None, status: int | None = None):
+        super().__init__(message)
+        self.code = code
+        self.status = status
+
+
+class Mazda6eRetryableError(Mazda6eApiError):
+    """Transient failure (timeout, connection error, 5xx), worth retrying."""
+
+
+class Mazda6eCircuitOpenError(Mazda6eApiError):
+    """Requests are paused after repeated failures."""
+
+
 def now_ts():
     return str(int(time.time()))
 
 
+def token_expiry(token: str | None) -> float | None:
+    """Return the expiry timestamp of a JWT token, None if it is unknown."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+def _criteria(blocks: set[str]) -> dict[str, str]:
+    """vechileCriteria mask requesting the given blocks"""
+    return {
+        criteria: "1" if criteria in blocks else "0"
+        for criteria in VEHICLE_CRITERIA
+    }
+
+
+def _prune(data, blocks: set[str]):
+    """drop blocks that were not requested right away"""
+    if not isinstance(data, dict):
+        return data
+    return {block: value for block, value in data.items() if block in blocks}
+
+
+def _retry_after(headers) -> float | None:
+    """seconds of a Retry-After header, HTTP dates are not used by the gateway"""
+    try:
+        return max(0.0, float(headers.get("Retry-After")))
+    except (TypeError, ValueError):
+        return None
+
+
 class Mazda6EApi:
-    def __init__(self, session: aiohttp.ClientSession, token=None, refresh=None, deviceid=None):
+    def __init__(
+            self,
+            session: aiohttp.ClientSession,
+            token=None,
+            refresh=None,
+            deviceid=None,
+            token_update_callback: Callable[[str, str], None] | None = None,
+            base_url: str = BASE,
+    ):
         self.session = session
+        # gateway root, can point to a local fake or recording proxy
+        self.base_url = base_url.rstrip("/")
         self.token = token
         self.refresh = refresh
         self.deviceid = deviceid
+        self.token_update_callback = token_update_callback
+        self._refresh_lock = asyncio.Lock()
+
+        self.request_timeout = REQUEST_TIMEOUT
+        self.request_retries = REQUEST_RETRIES
+        self.max_response_size = MAX_RESPONSE_SIZE
+        self.circuit_breaker = CircuitBreaker(CIRCUIT_BREAKER_THRESHOLD, CIRCUIT_BREAKER_COOLDOWN)
+        # whether condition/v2 accepts several vehicles at once, None until probed
+        self.batch_status_supported: bool | None = None
+        self.metrics = Metrics()
+        # shared by every request of this client, logins and token refreshes included
+        self.rate_limiter = RateLimiter(RATE_LIMIT, RATE_LIMIT_BURST)
+
+    async def _post(
+            self,
+            url: str,
+            headers: dict,
+            body: dict,
+            idempotent: bool = True,
+            priority: int = PRIORITY_POLL,
+    ) -> dict:
+        """POST with rate limit, timeout, jittered retries of transient errors and circuit breaker
+
+        requests that are not idempotent are never retried
+        """
+        if not self.circuit_breaker.allow_request():
+            raise Mazda6eCircuitOpenError(
+                f"Mazda API paused for {self.circuit_breaker.retry_in:.0f}s after repeated failures"
+            )
+
+        attempt = 0
+        while True:
+            self.metrics.queue_wait.observe(await self.rate_limiter.acquire(priority))
+
+            try:
+                raw = await self._post_once(url, headers, body)
+            except Mazda6eRetryableError as err:
+                if not idempotent or attempt >= self.request_retries:
+                    self.circuit_breaker.record_failure()
+                    raise
+
+                delay = RETRY_BACKOFF * 2 ** attempt
+                delay = delay / 2 + random.uniform(0, delay / 2)
+                attempt += 1
+                self.metrics.retries += 1
+
+                _LOGGER.debug("%s -> retry %s in %.1fs", err, attempt, delay)
+                await asyncio.sleep(delay)
+            else:
+                self.circuit_breaker.record_success()
+                return raw
+
+    async def _post_once(self, url: str, headers: dict, body: dict) -> dict:
+        timeout = aiohttp.ClientTimeout(total=self.request_timeout)
+        started = time.monotonic()
+        size = 0
+        failed = True
+
+        try:
+            async with self.session.post(url, headers=headers, json=body, timeout=timeout) as resp:
+                if resp.status == 429 or resp.status >= 500:
+                    retry_after = _retry_after(resp.headers)
+                    if resp.status == 429 and retry_after is None:
+                        retry_after = THROTTLE_PAUSE
+                    if retry_after is not None:
+                        self.rate_limiter.pause(retry_after)
+
+                    raise Mazda6eRetryableError(f"Mazda API HTTP {resp.status}", status=resp.status)
+                if resp.status >= 400:
+                    raise Mazda6eApiError(f"Mazda API HTTP {resp.status}", status=resp.status)
+
+                if (resp.content_length or 0) > self.max_response_size:
+                    raise Mazda6eApiError(f"Mazda API response too large: {resp.content_length} bytes")
+
+                # the length header may be missing, stop reading at the limit
+                content = bytearray()
+                async for chunk in resp.content.iter_chunked(64 * 1024):
+                    content += chunk
+                    size = len(content)
+                    if size > self.max_response_size:
+                        raise Mazda6eApiError(f"Mazda API response exceeds {self.max_response_size} bytes")
+
+                # orjson backed, the payload must be an object
+                raw = json_loads_object(content)
+                failed = False
+                return raw
+        except asyncio.TimeoutError as err:
+            raise Mazda6eRetryableError(f"Mazda API request timed out: {url}") from err
+        except aiohttp.ClientError as err:
+            raise Mazda6eRetryableError(f"Mazda API request failed: {err}") from err
+        except ValueError as err:
+            raise Mazda6eApiError(f"Mazda API returned invalid JSON: {err}") from err
+        finally:
+            self.metrics.record_request(
+                url.removeprefix(self.base_url), time.monotonic() - started, size, error=failed
+            )
 
-    async def _request(self, url: str, headers: dict, body: dict, retry: bool = True):
+    async def _request(
+            self,
+            url: str,
+            headers: dict,
+            body: dict,
+            retry: bool = True,
+            idempotent: bool = True,
+            priority: int = PRIORITY_POLL,
+    ):
         """generic request method with token refresh handling"""
-        async with self.session.post(url, headers=headers, json=body) as resp:
-            raw = await resp.json()
+        if retry and "authorization" in headers and self.refresh:
+            await self._refresh_token_if_expiring()
+            headers = {**headers, "authorization": self.token}
+
+        raw = await self._post(url, headers, body, idempotent, priority)
 
         if raw.get("success") is True:
             return raw
@@ -48,16 +261,18 @@ class Mazda6EApi:
                 raise ConfigEntryAuthFailed("Token expired and refresh failed")
 
             _LOGGER.debug("Token expired -> refreshing token...")
-            await self.refresh_token()
+            await self._refresh_token_once(headers.get("authorization"))
 
             headers = {**headers, "authorization": self.token}
 
-            # try again once
-            return await self._request(url, headers, body, retry=False)
-        raise Exception(f"Mazda API error: {raw}")
+            # try again once, the expired token was rejected before the request ran
+            return await self._request(
+                url, headers, body, retry=False, idempotent=idempotent, priority=priority
+            )
+        raise Mazda6eApiError(f"Mazda API error: {raw}", code=raw.get("code"))
 
     async def login_email_password(self, email_enc, password_enc):
-        url = f"{BASE}/cma-app-auth/api/login/email-pass-in/v2"
+        url = f"{self.base_url}/cma-app-auth/api/login/email-pass-in/v2"
         payload = {
             "loginTime": now_ts(),
             "email": email_enc,
@@ -66,18 +281,17 @@ class Mazda6EApi:
         }
         headers = {**HEADERS_BASE, "deviceid": self.deviceid}
 
-        async with self.session.post(url, json=payload, headers=headers) as resp:
-            data = await resp.json()
+        data = await self._post(url, headers, payload, idempotent=False, priority=PRIORITY_USER)
 
-            if not data.get("success"):
-                raise Exception("Email/Password Login failed")
+        if not data.get("success"):
+            raise Mazda6eApiError("Email/Password Login failed", code=data.get("code"))
 
-            self.token = data["data"]["token"]
-            self.refresh = data["data"]["refreshToken"]
-            return data["data"]
+        self.token = data["data"]["token"]
+        self.refresh = data["data"]["refreshToken"]
+        return data["data"]
 
     async def send_device_login(self, token, email_enc):
-        url = f"{BASE}/cma-app-user/api/send-email/device-login/send"
+        url = f"{self.base_url}/cma-app-user/api/send-email/device-login/send"
         payload = {
             "email": email_enc,
             "deviceName": DEVICE_NAME,
@@ -86,11 +300,11 @@ class Mazda6EApi:
         }
         headers = {**HEADERS_BASE, "authorization": token, "deviceid": self.deviceid}
 
-        await self._request(url, headers, payload)
+        await self._request(url, headers, payload, idempotent=False, priority=PRIORITY_USER)
         return True
 
     async def verify_device_code(self, token, email_enc, code):
-        url = f"{BASE}/cma-app-user/api/login-device/email-verify"
+        url = f"{self.base_url}/cma-app-user/api/login-device/email-verify"
         payload = {
             "authCode": code,
             "email": email_enc,
@@ -101,36 +315,60 @@ class Mazda6EApi:
         }
         headers = {**HEADERS_BASE, "authorization": token, "deviceid": self.deviceid}
 
-        await self._request(url, headers, payload)
+        await self._request(url, headers, payload, idempotent=False, priority=PRIORITY_USER)
         return True
 
+    async def _refresh_token_once(self, expired_token: str | None):
+        """Refresh the token unless a concurrent caller already replaced it."""
+        async with self._refresh_lock:
+            if self.token != expired_token:
+                _LOGGER.debug("Token already refreshed by a concurrent request")
+                return self.token
+
+            return await self.refresh_token()
+
+    async def _refresh_token_if_expiring(self):
+        """Refresh the token proactively shortly before it expires."""
+        expiry = token_expiry(self.token)
+        if expiry is None or expiry - time.time() > TOKEN_REFRESH_MARGIN:
+            return
+
+        _LOGGER.debug("Token expires soon -> refreshing token...")
+        await self._refresh_token_once(self.token)
+
     async def refresh_token(self):
-        url = f"{BASE}/cma-app-auth/api/auth/refresh-token"
+        url = f"{self.base_url}/cma-app-auth/api/auth/refresh-token"
         headers = {**HEADERS_BASE, "authorization": self.token}
 
         body = {"refreshToken": self.refresh}
 
-        async with self.session.post(url, headers=headers, json=body) as resp:
-            raw = await resp.json()
+        # every queued request waits for the new token; a retry could reuse a
+        # refresh token the first attempt already rotated
+        raw = await self._post(url, headers, body, idempotent=False, priority=PRIORITY_USER)
 
         _LOGGER.debug("refresh-token response: %s", raw)
+        self.metrics.token_refreshes += 1
 
         if not raw.get("success"):
             raise ConfigEntryAuthFailed("Token refresh failed")
 
         self.token = raw["data"]["token"]
         self.refresh = raw["data"]["refreshToken"]
+
+        if self.token_update_callback:
+            self.token_update_callback(self.token, self.refresh)
+
         return self.token
 
-    async def async_get_vehicles(self) -> list[Mazda6eVehicle]:
-        url = f"{BASE}/cma-app-user/api/vehicle/vehicles"
+    async def async_get_vehicles(self, priority: int = PRIORITY_POLL) -> list[Mazda6eVehicle]:
+        url = f"{self.base_url}/cma-app-user/api/vehicle/vehicles"
         headers = {
             **HEADERS_BASE,
             "authorization": self.token,
             "deviceid": self.deviceid,
         }
 
-        raw = await self._request(url, headers, {})
+        raw = await self._request(url, headers, {}, priority=priority)
 
         vehicles = []
         for v in raw.get("data", []):
@@ -143,33 +381,87 @@ class Mazda6EApi:
             )
         return vehicles
 
-    async def async_get_vehicle_status(self, vehicle_id: int):
-        url = f"{BASE}/cma-app-car-condition/api/vehicle/condition/v2"
+    async def async_get_vehicle_status(
+            self, vehicle_id: int, blocks: set[str] | None = None, priority: int = PRIORITY_POLL
+    ):
+        """fetch the status of a vehicle, limited to the given blocks if set"""
+        url = f"{self.base_url}/cma-app-car-condition/api/vehicle/condition/v2"
         headers = {
             **HEADERS_BASE,
             "authorization": self.token,
             "deviceid": self.deviceid,
         }
 
+        if blocks is None:
+            blocks = set(STATUS_BLOCKS)
+
         body = {
-            "vechileCriteria": {
-                "seat": "1",
-                "tire": "1",
-                "charge": "1",
-                "vehicleStatus": "1",
-                "hvac": "1",
-                "departurePlan": "0",
-                "fuel": "0",
-                "window": "1",
-                "door": "1",
-                "airConditionPlan": "0",
-                "lamp": "1",
-                "warmCoolingBox": "0",
-                "welcome": "0",
-                "location": "0"
-            },
+            "vechileCriteria": _criteria(blocks),
             "vehicleId": vehicle_id
         }
 
-        raw = await self._request(url, headers, body)
-        return raw.get("data")
+        raw = await self._request(url, headers, body, priority=priority)
+        return _prune(raw.get("data"), blocks)
+
+    async def async_get_vehicles_status(
+            self, requested: dict[int, set[str]], priority: int = PRIORITY_POLL
+    ) -> dict[int, dict] | None:
+        """fetch several vehicles with one condition/v2 call
+
+        The first call probes whether the gateway accepts a vehicle list, None
+        is returned as long as it does not. Vehicles missing in the answer are
+        left out of the result.
+        """
+        if self.batch_status_supported is False:
+            return None
+
+        url = f"{self.base_url}/cma-app-car-condition/api/vehicle/condition/v2"
+        headers = {
+            **HEADERS_BASE,
+            "authorization": self.token,
+            "deviceid": self.deviceid,
+        }
+        body = {
+            "vechileCriteria": _criteria(set().union(*requested.values())),
+            "vehicleIds": list(requested),
+        }
+
+        try:
+            raw = await self._request(url, headers, body, priority=priority)
+        except (Mazda6eRetryableError, Mazda6eCircuitOpenError):
+            raise
+        except Mazda6eApiError as err:
+            # oversized or invalid answers carry neither status nor code, they
+            # say nothing about the request shape
+            rejected = err.code is not None or (err.status is not None and err.status not in (401, 403))
+            if self.batch_status_supported or not rejected:
+                raise
+            _LOGGER.debug("Batched status request rejected, using one request per vehicle: %s", err)
+            self.batch_status_supported = False
+            return None
+
+        data = raw.get("data")
+        if not isinstance(data, list):
+            _LOGGER.debug("Batched status request not supported, using one request per vehicle")
+            self.batch_status_supported = False
+            return None
+
+        statuses = {}
+        for item in data:
+            if not isinstance(item, dict):
+                continue
+            try:
+                vehicle_id = int(item.get("vehicleId"))
+            except (TypeError, ValueError):
+                continue
+            if vehicle_id in requested:
+                statuses[vehicle_id] = _prune(item, requested[vehicle_id])
+
+        if statuses:
+            self.batch_status_supported = True
+        elif data and not self.batch_status_supported:
+            # the vehicle list was ignored, the answer is about other vehicles
+            _LOGGER.debug("Batched status request ignored the vehicle list, using one request per vehicle")
+            self.batch_status_supported = False
+
+        return statuses
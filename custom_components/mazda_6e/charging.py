@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMeanType, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics, get_last_statistics
+from homeassistant.const import PERCENTAGE, UnitOfElectricCurrent, UnitOfEnergy, UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from homeassistant.util.unit_conversion import (
+    DurationConverter,
+    ElectricCurrentConverter,
+    EnergyConverter,
+)
+
+from .const import DOMAIN, BATTERY_CAPACITY, CHARGE_VOLTAGE, MAX_INTEGRATION_GAP
+from .models import ChargeStatus, Mazda6eVehicle, VehicleStatus
+
+_LOGGER = logging.getLogger(__name__)
+
+# a paused session is continued when charging resumes
+_SESSION_END_STATES = (ChargeStatus.NOT_CHARGING, ChargeStatus.COMPLETED)
+
+
+@dataclass(slots=True)
+class ChargingSession:
+    """Aggregates of one charging session, updated per poll in O(1)."""
+    started_at: datetime
+    soc_start: float | None
+    soc_end: float | None = None
+    ended_at: datetime | None = None
+    current_sum: float = 0.0
+    current_min: float | None = None
+    current_max: float | None = None
+    samples: int = 0
+
+    def add_sample(self, soc: float | None, current: float | None) -> None:
+        if soc is not None:
+            if self.soc_start is None:
+                self.soc_start = soc
+            self.soc_end = soc
+
+        if current is not None:
+            self.current_sum += current
+            self.samples += 1
+            self.current_min = current if self.current_min is None else min(self.current_min, current)
+            self.current_max = current if self.current_max is None else max(self.current_max, current)
+
+    @property
+    def duration_minutes(self) -> float:
+        return ((self.ended_at or dt_util.utcnow()) - self.started_at).total_seconds() / 60
+
+    @property
+    def average_current(self) -> float | None:
+        return self.current_sum / self.samples if self.samples else None
+
+    @property
+    def energy_added(self) -> float | None:
+        """kWh, estimated from the SoC difference"""
+        if self.soc_start is None or self.soc_end is None:
+            return None
+        return max(0.0, self.soc_end - self.soc_start) / 100 * BATTERY_CAPACITY
+
+    def as_dict(self) -> dict[str, Any]:
+        """JSON serializable aggregates of an open session"""
+        return {**asdict(self), "started_at": self.started_at.isoformat(), "ended_at": None}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ChargingSession:
+        started_at = dt_util.parse_datetime(data["started_at"])
+        if started_at is None:
+            raise ValueError(f"invalid session start {data['started_at']!r}")
+        return cls(**{**data, "started_at": started_at})
+
+
+class ChargingSessionTracker:
+    """Detects charging sessions from ChargeStatus transitions."""
+
+    def __init__(self):
+        self._sessions: dict[int, ChargingSession] = {}
+
+    def get(self, vehicle_id: int) -> ChargingSession | None:
+        """Open session of the vehicle"""
+        return self._sessions.get(vehicle_id)
+
+    def restore(self, vehicle_id: int, session: ChargingSession) -> None:
+        """Continue a session that was open before a restart."""
+        self._sessions.setdefault(vehicle_id, session)
+
+    def update(self, vehicle_id: int, status: VehicleStatus, now: datetime) -> ChargingSession | None:
+        """Feed a freshly fetched status, returns the session that ended with it."""
+        if status.charge is None:
+            return None
+
+        soc = status.driving.soc if status.driving else None
+        charge_status = status.charge.charge_status
+        session = self._sessions.get(vehicle_id)
+
+        if charge_status == ChargeStatus.CHARGING:
+            if session is None:
+                _LOGGER.debug("Charging session of vehicle %s started", vehicle_id)
+                session = self._sessions[vehicle_id] = ChargingSession(started_at=now, soc_start=soc)
+            session.add_sample(soc, status.charge.charge_current)
+            return None
+
+        if session is None or charge_status not in _SESSION_END_STATES:
+            return None
+
+        session.add_sample(soc, None)
+        session.ended_at = now
+        del self._sessions[vehicle_id]
+
+        _LOGGER.debug("Charging session of vehicle %s ended: %s", vehicle_id, session)
+        return session
+
+
+@dataclass(slots=True)
+class ChargeEnergyEstimator:
+    """Charging power and energy, integrated per sample with the trapezoidal rule.
+
+    Only the previous sample is kept, every sample costs O(1).
+    """
+    power: float = 0.0  # kW
+    session_energy: float = 0.0  # kWh
+    total_energy: float = 0.0  # kWh
+    # unknown until the first sample, a restart mid-session continues the restored energy
+    _charging: bool | None = None
+    _last_at: datetime | None = None
+    _last_soc: float | None = None
+
+    def restore(self, session_energy: float | None = None, total_energy: float | None = None) -> None:
+        """Continue from values restored after a restart."""
+        if session_energy is not None:
+            self.session_energy = max(self.session_energy, session_energy)
+        if total_energy is not None:
+            self.total_energy = max(self.total_energy, total_energy)
+
+    def add_sample(self, status: VehicleStatus, now: datetime) -> None:
+        charge = status.charge
+        if charge is None:
+            return
+
+        charging = charge.charge_status == ChargeStatus.CHARGING
+        power = abs(charge.charge_current or 0) * CHARGE_VOLTAGE / 1000 if charging else 0.0
+        soc = status.driving.soc if status.driving else None
+
+        if charging and self._charging is False:
+            self.session_energy = 0.0
+
+        if self._last_at is not None and (charging or self._charging):
+            seconds = (now - self._last_at).total_seconds()
+
+            if seconds <= MAX_INTEGRATION_GAP:
+                added = (self.power + power) / 2 * seconds / 3600
+            elif soc is not None and self._last_soc is not None:
+                # too few samples to integrate, use the SoC difference
+                added = max(0.0, soc - self._last_soc) / 100 * BATTERY_CAPACITY
+            else:
+                added = 0.0
+
+            self.session_energy += added
+            self.total_energy += added
+
+        self.power = power
+        self._charging = charging
+        self._last_at = now
+        self._last_soc = soc
+
+
+def _statistic_id(name: str, vehicle: Mazda6eVehicle) -> str:
+    return f"{DOMAIN}:{name}_{vehicle.vehicle_id}"
+
+
+def _metadata(
+        vehicle: Mazda6eVehicle,
+        name: str,
+        title: str,
+        unit: str,
+        unit_class: str | None,
+        has_sum: bool,
+) -> StatisticMetaData:
+    return StatisticMetaData(
+        mean_type=StatisticMeanType.NONE if has_sum else StatisticMeanType.ARITHMETIC,
+        has_sum=has_sum,
+        name=f"Mazda 6e - {vehicle.vehicle_id} {title}",
+        source=DOMAIN,
+        statistic_id=_statistic_id(name, vehicle),
+        unit_class=unit_class,
+        unit_of_measurement=unit,
+    )
+
+
+async def _async_last_sum(hass: HomeAssistant, statistic_id: str) -> float:
+    last = await get_instance(hass).async_add_executor_job(
+        get_last_statistics, hass, 1, statistic_id, True, {"sum"}
+    )
+    if not last.get(statistic_id):
+        return 0.0
+    return last[statistic_id][0].get("sum") or 0.0
+
+
+async def async_import_charging_session(
+        hass: HomeAssistant, vehicle: Mazda6eVehicle, session: ChargingSession
+) -> None:
+    """Write the aggregates of a finished session as external statistics, all at once."""
+    start = session.ended_at.replace(minute=0, second=0, microsecond=0)
+
+    sums = {
+        "charging_energy": (session.energy_added, "Charging energy", UnitOfEnergy.KILO_WATT_HOUR, EnergyConverter.UNIT_CLASS),
+        "charging_duration": (session.duration_minutes, "Charging duration", UnitOfTime.MINUTES, DurationConverter.UNIT_CLASS),
+    }
+    for name, (value, title, unit, unit_class) in sums.items():
+        if value is None:
+            continue
+
+        statistic_id = _statistic_id(name, vehicle)
+        total = await _async_last_sum(hass, statistic_id) + value
+        async_add_external_statistics(
+            hass,
+            _metadata(vehicle, name, title, unit, unit_class, has_sum=True),
+            [StatisticData(start=start, state=value, sum=total)],
+        )
+
+    if session.soc_start is not None and session.soc_end is not None:
+        async_add_external_statistics(
+            hass,
+            _metadata(vehicle, "charging_soc", "Charging SoC", PERCENTAGE, None, has_sum=False),
+            [StatisticData(
+                start=start,
+                min=session.soc_start,
+                max=session.soc_end,
+                mean=(session.soc_start + session.soc_end) / 2,
+            )],
+        )
+
+    if session.average_current is not None:
+        async_add_external_statistics(
+            hass,
+            _metadata(
+                vehicle,
+                "charging_current",
+                "Charging current",
+                UnitOfElectricCurrent.AMPERE,
+                ElectricCurrentConverter.UNIT_CLASS,
+                has_sum=False,
+            ),
+            [StatisticData(
+                start=start,
+                min=session.current_min,
+                max=session.current_max,
+                mean=session.average_current,
+            )],
+        )
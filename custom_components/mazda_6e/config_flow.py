@@ -7,7 +7,26 @@ from homeassistant.core import callback
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
 from homeassistant.helpers import aiohttp_client
 
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    UPDATE_INTERVAL,
+    MIN_UPDATE_INTERVAL,
+    MAX_UPDATE_INTERVAL,
+    BLOCK_UPDATE_INTERVALS,
+    MAX_CONCURRENT_REQUESTS,
+    REQUEST_TIMEOUT,
+    VEHICLES_CACHE_TTL,
+    MAX_DATA_AGE,
+    CONF_UPDATE_INTERVAL,
+    CONF_MIN_UPDATE_INTERVAL,
+    CONF_MAX_UPDATE_INTERVAL,
+    CONF_TIRE_UPDATE_INTERVAL,
+    CONF_LOCATION_UPDATE_INTERVAL,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_REQUEST_TIMEOUT,
+    CONF_VEHICLES_CACHE_TTL,
+    CONF_MAX_DATA_AGE,
+)
 from .api import Mazda6EApi
 
 _LOGGER = logging.getLogger(__name__)
@@ -22,9 +41,28 @@ STEP3_SCHEMA = vol.Schema({
 })
 
 
+# option -> (default, minimum, maximum), all in seconds except the concurrency
+OPTIONS = {
+    CONF_UPDATE_INTERVAL: (UPDATE_INTERVAL, 30, 3600),
+    CONF_MIN_UPDATE_INTERVAL: (MIN_UPDATE_INTERVAL, 15, 3600),
+    CONF_MAX_UPDATE_INTERVAL: (MAX_UPDATE_INTERVAL, 30, 6 * 3600),
+    CONF_TIRE_UPDATE_INTERVAL: (BLOCK_UPDATE_INTERVALS["tire"], 0, 24 * 3600),
+    CONF_LOCATION_UPDATE_INTERVAL: (BLOCK_UPDATE_INTERVALS["location"], 0, 24 * 3600),
+    CONF_MAX_CONCURRENT_REQUESTS: (MAX_CONCURRENT_REQUESTS, 1, 10),
+    CONF_REQUEST_TIMEOUT: (REQUEST_TIMEOUT, 5, 120),
+    CONF_VEHICLES_CACHE_TTL: (VEHICLES_CACHE_TTL, 0, 7 * 24 * 3600),
+    CONF_MAX_DATA_AGE: (MAX_DATA_AGE, 0, 7 * 24 * 3600),
+}
+
+
 class Mazda6eConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        return Mazda6eOptionsFlowHandler()
+
     def __init__(self):
         self.device_name = None
         self.token = None
@@ -164,3 +202,36 @@ class Mazda6eConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
         return self.async_abort(reason="reauth_successful")
+
+
+class Mazda6eOptionsFlowHandler(config_entries.OptionsFlow):
+    """Polling and request tuning, applied without reloading the entry."""
+
+    async def async_step_init(self, user_input=None):
+        errors = {}
+
+        if user_input is not None:
+            if not (
+                user_input[CONF_MIN_UPDATE_INTERVAL]
+                <= user_input[CONF_UPDATE_INTERVAL]
+                <= user_input[CONF_MAX_UPDATE_INTERVAL]
+            ):
+                errors["base"] = "invalid_update_intervals"
+            elif user_input[CONF_MAX_DATA_AGE] < user_input[CONF_MAX_UPDATE_INTERVAL]:
+                # an idle vehicle would lose its entities between two polls
+                errors["base"] = "invalid_max_data_age"
+            else:
+                return self.async_create_entry(data=user_input)
+
+        current = user_input or self.config_entry.options
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema({
+                vol.Required(key, default=current.get(key, default)): vol.All(
+                    vol.Coerce(int), vol.Range(min=minimum, max=maximum)
+                )
+                for key, (default, minimum, maximum) in OPTIONS.items()
+            }),
+            errors=errors,
+        )
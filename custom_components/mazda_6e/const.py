@@ -5,3 +5,64 @@ PUB_KEY = "MIGfMA0GCSqGSIb3DQEBAQUAA4GNADCBiQKBgQCRYk7lZkHwHCJo8sSoKs5UuD/Jh9j7P
 DEVICE_NAME = "iPhone 17 Pro"
 
 UPDATE_INTERVAL = 60  # Sekunden
+
+MAX_CONCURRENT_REQUESTS = 4  # parallel status requests per refresh
+
+VEHICLES_CACHE_TTL = 6 * 60 * 60  # Sekunden
+
+# adaptive polling bounds
+MIN_UPDATE_INTERVAL = 30  # Sekunden, while charging or driving
+MAX_UPDATE_INTERVAL = 15 * 60  # Sekunden, parked vehicle
+PARKED_GRACE_PERIOD = 10 * 60  # Sekunden without changes before backing off
+
+TOKEN_SAVE_DELAY = 10  # Sekunden, debounce for persisting refreshed tokens
+
+# blocks of condition/v2 that are polled less often than the vehicle itself
+BLOCK_UPDATE_INTERVALS = {
+    "location": 60 * 60,  # Sekunden, while parked
+    "tire": 60 * 60,  # Sekunden
+}
+
+# blocks always requested, the poll scheduler depends on them
+ALWAYS_REQUESTED_BLOCKS = ("vehicleStatus", "charge")
+
+# request handling
+REQUEST_TIMEOUT = 15  # Sekunden per request
+REQUEST_RETRIES = 2  # retries of timeouts, connection errors and 5xx
+RETRY_BACKOFF = 1.0  # Sekunden, doubled on every retry
+CIRCUIT_BREAKER_THRESHOLD = 5  # consecutive failures before requests are paused
+CIRCUIT_BREAKER_COOLDOWN = 5 * 60  # Sekunden
+
+BATTERY_CAPACITY = 68.8  # kWh, usable capacity used to estimate charged energy from SoC
+
+CHARGE_VOLTAGE = 400  # V, nominal pack voltage used to derive charging power from chargeCurrent
+MAX_INTEGRATION_GAP = 30 * 60  # Sekunden, longer gaps fall back to the SoC difference
+
+STATUS_CACHE_SAVE_DELAY = 60  # Sekunden, writes of the on-disk status cache are coalesced
+
+MAX_DATA_AGE = 2 * 60 * 60  # Sekunden, last good data is served this long while the API fails
+
+BLOCK_PROBE_INTERVAL = 60 * 60  # Sekunden, blocks a vehicle never returned are requested again this often
+
+MAX_RESPONSE_SIZE = 1024 * 1024  # bytes, larger responses are rejected
+
+ON_DEMAND_REFRESH_DELAY = 2  # Sekunden, update_entity calls within this window share one request
+ON_DEMAND_MIN_INTERVAL = 30  # Sekunden, a vehicle is not fetched on demand more often
+
+LOCATION_RECENT_CHANGE = 10 * 60  # Sekunden, location is fetched with every poll this long after doors/windows changed
+LOCATION_MIN_DISTANCE = 50  # m, smaller movements are not written to the device tracker
+
+# options of the config entry, defaults are the constants above
+CONF_UPDATE_INTERVAL = "update_interval"
+CONF_MIN_UPDATE_INTERVAL = "min_update_interval"
+CONF_MAX_UPDATE_INTERVAL = "max_update_interval"
+CONF_TIRE_UPDATE_INTERVAL = "tire_update_interval"
+CONF_LOCATION_UPDATE_INTERVAL = "location_update_interval"
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+CONF_REQUEST_TIMEOUT = "request_timeout"
+CONF_VEHICLES_CACHE_TTL = "vehicles_cache_ttl"
+CONF_MAX_DATA_AGE = "max_data_age"
+
+RATE_LIMIT = 0.5  # requests per second over all API calls of a login
+RATE_LIMIT_BURST = 10  # requests passed without waiting
+THROTTLE_PAUSE = 60  # Sekunden, pause after HTTP 429 without Retry-After
@@ -1,14 +1,60 @@
+import asyncio
 import logging
+import time
 
-from datetime import timedelta
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Mapping
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, UPDATE_INTERVAL
-from .models import Mazda6eVehicle
+from .const import (
+    DOMAIN,
+    UPDATE_INTERVAL,
+    MAX_CONCURRENT_REQUESTS,
+    VEHICLES_CACHE_TTL,
+    MIN_UPDATE_INTERVAL,
+    MAX_UPDATE_INTERVAL,
+    PARKED_GRACE_PERIOD,
+    BLOCK_UPDATE_INTERVALS,
+    ALWAYS_REQUESTED_BLOCKS,
+    MAX_DATA_AGE,
+    BLOCK_PROBE_INTERVAL,
+    ON_DEMAND_REFRESH_DELAY,
+    ON_DEMAND_MIN_INTERVAL,
+    LOCATION_RECENT_CHANGE,
+    REQUEST_TIMEOUT,
+    CONF_UPDATE_INTERVAL,
+    CONF_MIN_UPDATE_INTERVAL,
+    CONF_MAX_UPDATE_INTERVAL,
+    CONF_TIRE_UPDATE_INTERVAL,
+    CONF_LOCATION_UPDATE_INTERVAL,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_REQUEST_TIMEOUT,
+    CONF_VEHICLES_CACHE_TTL,
+    CONF_MAX_DATA_AGE,
+)
+from .api import STATUS_BLOCKS, Mazda6eApiError, Mazda6eCircuitOpenError, Mazda6eRetryableError
+from .binary_sensor import SENSOR_TYPES as BINARY_SENSOR_TYPES
+from .device_tracker import TRACKER_TYPES
+from .charging import ChargeEnergyEstimator, ChargingSessionTracker, async_import_charging_session
+from .extractors import build_value_table
+from .sensor import SENSOR_TYPES
+from .helpers.rate_limiter import PRIORITY_BACKGROUND, PRIORITY_POLL, PRIORITY_USER
+from .helpers.scheduler import PollScheduler
+from .models import Mazda6eVehicle, VehicleStatus
 
 _LOGGER = logging.getLogger(__name__)
 
+# descriptions evaluated into the value table of each vehicle
+VALUE_DESCRIPTIONS = (*SENSOR_TYPES, *BINARY_SENSOR_TYPES, *TRACKER_TYPES)
+
+# blocks parsed into a VehicleStatus, others never show up as seen and are not probed
+PROBED_BLOCKS = tuple(block for block, _ in VehicleStatus.BLOCKS.values())
+
 
 class Mazda6eCoordinator(DataUpdateCoordinator):
     def __init__(self, hass, config_entry, mazda6e_api):
@@ -19,28 +65,399 @@ class Mazda6eCoordinator(DataUpdateCoordinator):
             name=DOMAIN,
             config_entry=config_entry,
             update_interval=timedelta(seconds=UPDATE_INTERVAL),
+            # listeners are only notified if the data changed
+            always_update=False,
         )
         self.api = mazda6e_api
+        self.max_concurrent_requests = MAX_CONCURRENT_REQUESTS
+        self.vehicles_cache_ttl = VEHICLES_CACHE_TTL
+        self.max_data_age = MAX_DATA_AGE
+
+        self._vehicles: list[Mazda6eVehicle] | None = None
+        self._vehicles_fetched_at = 0.0
+
+        self.scheduler = PollScheduler(
+            base_interval=UPDATE_INTERVAL,
+            min_interval=MIN_UPDATE_INTERVAL,
+            max_interval=MAX_UPDATE_INTERVAL,
+            parked_grace_period=PARKED_GRACE_PERIOD,
+        )
+
+        self.charging_sessions = ChargingSessionTracker()
+        self._energy_estimators: dict[int, ChargeEnergyEstimator] = {}
+
+        self.block_update_intervals = dict(BLOCK_UPDATE_INTERVALS)
+        self.block_probe_interval = BLOCK_PROBE_INTERVAL
+        # blocks used by enabled entities and the time they were fetched last
+        self._block_users: dict[int, Counter] = {}
+        self._block_fetched: dict[int, dict[str, float]] = {}
+        # capability map: blocks each vehicle returned at least once
+        self._seen_blocks: dict[int, set[str]] = {}
+
+        # vehicles asked for by update_entity, fetched together after a short delay
+        self.on_demand_min_interval = ON_DEMAND_MIN_INTERVAL
+        self._on_demand_vehicles: set[int] = set()
+        self._on_demand_debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=ON_DEMAND_REFRESH_DELAY,
+            immediate=False,
+            function=self._async_refresh_on_demand,
+        )
+
+    @callback
+    def async_register_block(self, vehicle_id: int, block: str) -> CALLBACK_TYPE:
+        """Request a status block for a vehicle until the returned callback is called."""
+        users = self._block_users.setdefault(vehicle_id, Counter())
+        users[block] += 1
+
+        @callback
+        def _remove() -> None:
+            users[block] -= 1
+            if users[block] <= 0:
+                del users[block]
+
+        return _remove
+
+    @callback
+    def async_register_vehicle(self, vehicle_id: int) -> None:
+        """Mark the entities of a vehicle as set up, from now on only their blocks are fetched."""
+        self._block_users.setdefault(vehicle_id, Counter())
+
+    @callback
+    def async_apply_options(self, options: Mapping[str, Any]) -> None:
+        """Apply the tuning options of a config entry to the running coordinator."""
+        self.scheduler.base_interval = options.get(CONF_UPDATE_INTERVAL, UPDATE_INTERVAL)
+        self.scheduler.min_interval = options.get(CONF_MIN_UPDATE_INTERVAL, MIN_UPDATE_INTERVAL)
+        self.scheduler.max_interval = options.get(CONF_MAX_UPDATE_INTERVAL, MAX_UPDATE_INTERVAL)
+
+        self.block_update_intervals.update(
+            tire=options.get(CONF_TIRE_UPDATE_INTERVAL, BLOCK_UPDATE_INTERVALS["tire"]),
+            location=options.get(CONF_LOCATION_UPDATE_INTERVAL, BLOCK_UPDATE_INTERVALS["location"]),
+        )
+
+        self.max_concurrent_requests = options.get(CONF_MAX_CONCURRENT_REQUESTS, MAX_CONCURRENT_REQUESTS)
+        self.vehicles_cache_ttl = options.get(CONF_VEHICLES_CACHE_TTL, VEHICLES_CACHE_TTL)
+        self.max_data_age = options.get(CONF_MAX_DATA_AGE, MAX_DATA_AGE)
+        self.api.request_timeout = options.get(CONF_REQUEST_TIMEOUT, REQUEST_TIMEOUT)
+
+        _LOGGER.debug("Applied options %s", dict(options))
+
+    async def async_request_vehicle_refresh(self, vehicle_id: int) -> None:
+        """Refresh a single vehicle soon, coalesced with other requests in the same window."""
+        self._on_demand_vehicles.add(vehicle_id)
+        await self._on_demand_debouncer.async_call()
+
+    async def _async_refresh_on_demand(self) -> None:
+        vehicle_ids, self._on_demand_vehicles = self._on_demand_vehicles, set()
+
+        if not self.data or not self.api.circuit_breaker.allow_request():
+            return
+
+        now = time.monotonic()
+        due = [
+            self.data[vehicle_id]["vehicle"]
+            for vehicle_id in vehicle_ids
+            if vehicle_id in self.data
+            and now - max(self._block_fetched.get(vehicle_id, {}).values(), default=0.0)
+            >= self.on_demand_min_interval
+        ]
+        if not due:
+            _LOGGER.debug("Skipping on-demand refresh of %s, fetched recently", vehicle_ids)
+            return
+
+        requested = {veh.vehicle_id: self._blocks_to_fetch(veh.vehicle_id, now) for veh in due}
+        try:
+            # somebody asked for it, served before the scheduled polls
+            results = await self._async_fetch_statuses(due, requested, PRIORITY_USER)
+        except ConfigEntryAuthFailed as err:
+            # the regular refresh starts the reauth
+            _LOGGER.warning("On-demand refresh failed: %s", err)
+            return
+
+        data = dict(self.data)
+        fetched_at = dt_util.utcnow()
+
+        for veh, result in zip(due, results):
+            if isinstance(result, BaseException):
+                # the regular refresh deals with the error
+                _LOGGER.warning(
+                    "On-demand refresh of vehicle %s failed: %s", veh.vehicle_id, result
+                )
+                continue
+
+            data[veh.vehicle_id] = self._process_status(
+                veh, result, requested[veh.vehicle_id], now, fetched_at
+            )
+
+        if data != self.data:
+            self.data = data
+            self.async_update_listeners()
+
+    async def async_shutdown(self) -> None:
+        self._on_demand_debouncer.async_shutdown()
+        await super().async_shutdown()
+
+    def energy_estimator(self, vehicle_id: int) -> ChargeEnergyEstimator:
+        """Charging power/energy estimator of a vehicle."""
+        return self._energy_estimators.setdefault(vehicle_id, ChargeEnergyEstimator())
+
+    def _blocks_to_fetch(self, vehicle_id: int, now: float) -> set[str]:
+        """Blocks used by enabled entities that are due for this vehicle."""
+        # entities not set up yet (first refresh), fetch everything
+        if vehicle_id not in self._block_users:
+            return set(STATUS_BLOCKS)
+
+        # empty if all entities reading blocks are disabled
+        users = self._block_users[vehicle_id]
+
+        fetched = self._block_fetched.get(vehicle_id, {})
+        seen = self._seen_blocks.get(vehicle_id, ())
+        blocks = set(ALWAYS_REQUESTED_BLOCKS)
+
+        for block in STATUS_BLOCKS:
+            if block in users:
+                interval = self._block_interval(vehicle_id, block, now)
+            elif block in PROBED_BLOCKS and block not in seen:
+                # missing so far, probed now and then so its entities are added once it shows up
+                interval = self.block_probe_interval
+            else:
+                continue
+
+            last = fetched.get(block)
+            if last is None or now - last >= interval:
+                blocks.add(block)
+
+        return blocks
+
+    def _block_interval(self, vehicle_id: int, block: str, now: float) -> float:
+        """Minimum seconds between two fetches of a block."""
+        # the location follows the car while it moves or somebody is at it
+        if block == "location" and (
+            self.scheduler.is_moving(vehicle_id)
+            or self.scheduler.changed_recently(vehicle_id, now, LOCATION_RECENT_CHANGE)
+        ):
+            return 0
+
+        return self.block_update_intervals.get(block, 0)
+
+    def capabilities(self, vehicle_id: int) -> frozenset[str]:
+        """Status blocks the vehicle returned at least once."""
+        return frozenset(self._seen_blocks.get(vehicle_id, ()))
+
+    def block_fetched_at(self, vehicle_id: int) -> dict[str, datetime]:
+        """Time each status block of a vehicle was last fetched."""
+        entry = (self.data or {}).get(vehicle_id) or {}
+        return entry.get("fetched") or {}
+
+    def _is_within_budget(self, entry: dict, now: datetime) -> bool:
+        """Whether the newest block of a vehicle is younger than the staleness budget."""
+        fetched = entry.get("fetched")
+        if not fetched:
+            return False
+        return (now - max(fetched.values())).total_seconds() <= self.max_data_age
+
+    def _serve_stale(self, err: Exception) -> dict:
+        """Keep the last good data within the staleness budget, fail with err when none is left."""
+        now = dt_util.utcnow()
+        data = {
+            vehicle_id: entry
+            for vehicle_id, entry in (self.data or {}).items()
+            if self._is_within_budget(entry, now)
+        }
+        if not data:
+            raise err
+
+        _LOGGER.warning("Mazda API unavailable (%s), serving the last known status", err)
+        return data
+
+    def invalidate_vehicles(self) -> None:
+        """Force the vehicle list to be fetched again on the next refresh."""
+        self._vehicles = None
+
+    async def _async_get_vehicles(self) -> list[Mazda6eVehicle]:
+        """Return the cached vehicle list, fetching it when missing or expired."""
+        if (
+            self._vehicles is None
+            or time.monotonic() - self._vehicles_fetched_at > self.vehicles_cache_ttl
+        ):
+            # an expired list is only housekeeping, a missing one blocks the poll
+            self._vehicles = await self.api.async_get_vehicles(
+                PRIORITY_POLL if self._vehicles is None else PRIORITY_BACKGROUND
+            )
+            self._vehicles_fetched_at = time.monotonic()
+
+            _LOGGER.debug("vehicles_response: %s", self._vehicles)
+
+        return self._vehicles
 
     async def _async_update_data(self):
         """Fetch data from API"""
+        started = time.monotonic()
+        try:
+            return await self._async_fetch_data()
+        finally:
+            self.api.metrics.record_refresh(time.monotonic() - started)
+
+    async def _async_fetch_data(self):
+        breaker = self.api.circuit_breaker
+        if not breaker.allow_request():
+            # no polling until the cool-down is over
+            self.update_interval = timedelta(seconds=max(breaker.retry_in, self.scheduler.min_interval))
+            return self._serve_stale(UpdateFailed("Mazda API paused after repeated failures"))
 
         # get vehicles
-        vehicles_response = await self.api.async_get_vehicles()
+        try:
+            vehicles = await self._async_get_vehicles()
+        except Mazda6eApiError as err:
+            return self._serve_stale(err)
+
+        previous = self.data or {}
+
+        now = time.monotonic()
+        self.scheduler.retain(veh.vehicle_id for veh in vehicles)
+
+        # parked vehicles are polled less often, keep their last data in between
+        due = [
+            veh for veh in vehicles
+            if veh.vehicle_id not in previous or self.scheduler.is_due(veh.vehicle_id, now)
+        ]
+
+        requested = {veh.vehicle_id: self._blocks_to_fetch(veh.vehicle_id, now) for veh in due}
+        results = await self._async_fetch_statuses(due, requested)
+
+        # vehicles not fetched now keep their last data while it is within the staleness budget,
+        # read after the fetch, an on-demand refresh may have updated it in the meantime
+        current = self.data or {}
+        fetched_at = dt_util.utcnow()
+        vehicle_status = {
+            veh.vehicle_id: current[veh.vehicle_id]
+            for veh in vehicles
+            if veh.vehicle_id in current and self._is_within_budget(current[veh.vehicle_id], fetched_at)
+        }
+        errors = []
+
+        for veh, result in zip(due, results):
+            if isinstance(result, ConfigEntryAuthFailed):
+                self.invalidate_vehicles()
+                raise result
+
+            if isinstance(result, BaseException):
+                errors.append(result)
+                _LOGGER.warning(
+                    "Fetching status for vehicle %s failed: %s", veh.vehicle_id, result
+                )
+
+                # rejected by the gateway, the vehicle may have been removed from the account
+                if isinstance(result, Mazda6eApiError) and not isinstance(
+                    result, (Mazda6eRetryableError, Mazda6eCircuitOpenError)
+                ):
+                    self.invalidate_vehicles()
 
-        _LOGGER.debug("vehicles_response: %s", vehicles_response)
+                # last known data of this vehicle is kept
+                self.scheduler.postpone(veh.vehicle_id, now)
+                continue
 
-        vehicles: list[Mazda6eVehicle] = vehicles_response
-        vehicle_status = {}
+            vehicle_status[veh.vehicle_id] = self._process_status(
+                veh, result, requested[veh.vehicle_id], now, fetched_at
+            )
 
-        # get status for each vehicle
-        for veh in vehicles:
-            status_response = await self.api.async_get_vehicle_status(veh.vehicle_id)
+        self.update_interval = timedelta(seconds=self.scheduler.next_interval(time.monotonic()))
 
-            vehicle_status[veh.vehicle_id] = {
-                "vehicle": veh,
-                "status": status_response,
-            }
+        if errors and len(errors) == len(due):
+            return self._serve_stale(UpdateFailed(f"Fetching vehicle status failed: {errors[0]}"))
 
         _LOGGER.debug("vehicle_status: %s", vehicle_status)
         return vehicle_status
+
+    async def _async_fetch_statuses(
+            self,
+            due: list[Mazda6eVehicle],
+            requested: dict[int, set[str]],
+            priority: int = PRIORITY_POLL,
+    ) -> list:
+        """Status of each due vehicle, or the exception fetching it raised.
+
+        Several vehicles are fetched with one batched request if the gateway
+        supports it, the others with concurrent requests per vehicle.
+        """
+        batched: dict[int, dict] = {}
+
+        if len(due) > 1 and self.api.batch_status_supported is not False:
+            try:
+                batched = await self.api.async_get_vehicles_status(requested, priority) or {}
+            except ConfigEntryAuthFailed:
+                self.invalidate_vehicles()
+                raise
+            except Mazda6eApiError as err:
+                _LOGGER.debug("Batched status request failed, fetching vehicles one by one: %s", err)
+
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+
+        async def fetch_status(veh: Mazda6eVehicle):
+            async with semaphore:
+                return await self.api.async_get_vehicle_status(
+                    veh.vehicle_id, requested[veh.vehicle_id], priority
+                )
+
+        single = [veh for veh in due if veh.vehicle_id not in batched]
+
+        # get status for the remaining vehicles concurrently
+        results = await asyncio.gather(
+            *(fetch_status(veh) for veh in single),
+            return_exceptions=True,
+        )
+        batched.update(zip((veh.vehicle_id for veh in single), results))
+
+        return [batched[veh.vehicle_id] for veh in due]
+
+    def _process_status(
+            self,
+            veh: Mazda6eVehicle,
+            result: dict | None,
+            blocks: set[str],
+            now: float,
+            fetched_at: datetime,
+    ) -> dict:
+        """Build the data entry of a freshly fetched vehicle and feed the trackers."""
+        status = self._merge_status(veh.vehicle_id, result, blocks, now)
+        values, attributes = build_value_table(status, VALUE_DESCRIPTIONS)
+
+        entry = {
+            "vehicle": veh,
+            "status": status,
+            # entity values, evaluated once per refresh
+            "values": values,
+            "attributes": attributes,
+            # wall clock time each block was fetched
+            "fetched": {
+                **self.block_fetched_at(veh.vehicle_id),
+                **dict.fromkeys(blocks, fetched_at),
+            },
+        }
+        self.scheduler.update(veh.vehicle_id, status, now)
+
+        self.energy_estimator(veh.vehicle_id).add_sample(status, fetched_at)
+
+        if session := self.charging_sessions.update(veh.vehicle_id, status, fetched_at):
+            self.hass.async_create_task(
+                async_import_charging_session(self.hass, veh, session)
+            )
+
+        # the open session is cached with the status, a restart continues it
+        entry["charging_session"] = self.charging_sessions.get(veh.vehicle_id)
+
+        return entry
+
+    def _merge_status(self, vehicle_id: int, result: dict | None, blocks: set[str], now: float) -> VehicleStatus:
+        """Parse the fetched blocks and keep the blocks not requested this time."""
+        previous = (self.data or {}).get(vehicle_id) or {}
+        status = VehicleStatus.from_dict(result, blocks)
+        self._seen_blocks.setdefault(vehicle_id, set()).update(status.available_blocks())
+        status = status.merge(previous.get("status"))
+
+        fetched = self._block_fetched.setdefault(vehicle_id, {})
+        for block in blocks:
+            fetched[block] = now
+
+        return status
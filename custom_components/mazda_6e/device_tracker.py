@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+
+from homeassistant.components.device_tracker import SourceType, TrackerEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import EntityDescription
+from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+from homeassistant.util.location import distance
+
+from .const import DOMAIN, LOCATION_MIN_DISTANCE
+from .entity import Mazda6eEntity, async_add_vehicle_entities
+from .extractors import Extractor
+from .models import LocationState, Mazda6eVehicle
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _coordinates(location: LocationState) -> tuple[float, float]:
+    if location.latitude is None or location.longitude is None:
+        raise ValueError("location without coordinates")
+    return location.latitude, location.longitude
+
+
+@dataclass(frozen=True, kw_only=True)
+class Mazda6eTrackerDescription(EntityDescription):
+    """Description of a Mazda 6e device tracker."""
+    value: Extractor
+    attrs: dict[str, Extractor] | None = None
+
+
+TRACKER_TYPES: tuple[Mazda6eTrackerDescription, ...] = (
+    Mazda6eTrackerDescription(
+        key="location",
+        translation_key="location",
+        icon="mdi:car",
+        value=Extractor(("location",), _coordinates),
+    ),
+)
+
+
+async def async_setup_entry(
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        async_add_entities: AddConfigEntryEntitiesCallback,
+) -> None:
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    def create_entities(vehicle: Mazda6eVehicle, data: dict, added: set[str]) -> list[Mazda6eEntity]:
+        return [
+            Mazda6eDeviceTracker(
+                coordinator=coordinator,
+                vehicle=vehicle,
+                vehicle_id=f"{vehicle.vehicle_id}",
+                description=description,
+            )
+            for description in TRACKER_TYPES
+            if description.key not in added and description.key in data["values"]
+        ]
+
+    async_add_vehicle_entities(entry, coordinator, async_add_entities, create_entities)
+
+
+class Mazda6eDeviceTracker(Mazda6eEntity, TrackerEntity):
+    """GPS position of the vehicle, small movements are not written."""
+
+    entity_description: Mazda6eTrackerDescription
+
+    _position: tuple[float, float] | None = None
+
+    @property
+    def source_type(self) -> SourceType:
+        return SourceType.GPS
+
+    async def async_added_to_hass(self) -> None:
+        self._update_position()
+        await super().async_added_to_hass()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._update_position()
+        super()._handle_coordinator_update()
+
+    def _update_position(self) -> None:
+        """Take the fetched position, unless it is within LOCATION_MIN_DISTANCE of the written one."""
+        data = self.vehicle_data
+        position = data["values"].get(self.entity_description.key) if data else None
+        if position is None:
+            return
+
+        latitude, longitude = position
+        if self._position is None or distance(*self._position, latitude, longitude) >= LOCATION_MIN_DISTANCE:
+            self._position = (latitude, longitude)
+
+    def _state_snapshot(self):
+        return self._position
+
+    @property
+    def latitude(self) -> float | None:
+        return self._position[0] if self._position else None
+
+    @property
+    def longitude(self) -> float | None:
+        return self._position[1] if self._position else None
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+from dataclasses import asdict
 from typing import Any
 
 from homeassistant.components.diagnostics.util import async_redact_data
@@ -15,7 +16,12 @@ from .const import DOMAIN
 _LOGGER = logging.getLogger(__name__)
 
 TO_REDACT_CONFIG = [CONF_EMAIL, CONF_PASSWORD, 'email_enc', 'refresh', 'token']
-TO_REDACT_DATA = ["vin", "vehicle_id", "token", "access_token", "refresh_token", "session_id"]
+TO_REDACT_DATA = ["vin", "vehicle_id", "token", "access_token", "refresh_token", "session_id", "latitude", "longitude"]
+
+
+def _status_dict(status) -> dict:
+    """Parsed vehicle status as plain dict."""
+    return asdict(status) if status is not None else {}
 
 
 async def async_get_config_entry_diagnostics(
@@ -28,17 +34,19 @@ async def async_get_config_entry_diagnostics(
     vehicles = []
 
     for vehicle_id, entry in data_entry.data.items():
-        vehicle_status = entry.get("status", {})
+        vehicle_status = _status_dict(entry.get("status"))
         vehicles.append(
             {
                 "vehicle_id": vehicle_id,
                 "status": async_redact_data(vehicle_status, TO_REDACT_DATA),
+                "capabilities": sorted(data_entry.capabilities(vehicle_id)),
             }
         )
 
     diagnostics = {
         "info": async_redact_data(config_entry.data, TO_REDACT_CONFIG),
         "vehicles": vehicles,
+        "metrics": data_entry.api.metrics.as_dict(),
     }
 
     return diagnostics
@@ -63,7 +71,7 @@ async def async_get_device_diagnostics(
 
     diagnostics_data = {
         "info": async_redact_data(config_entry.data, TO_REDACT_CONFIG),
-        "data": async_redact_data(target_vehicle.get("status", {}), TO_REDACT_DATA),
+        "data": async_redact_data(_status_dict(target_vehicle.get("status")), TO_REDACT_DATA),
     }
 
     return diagnostics_data
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, Callable
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.helpers.device_registry import DeviceInfo
+
+from .const import DOMAIN
+from .models import Mazda6eVehicle
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Mazda6eEntity(CoordinatorEntity):
+    """Base of all Mazda 6e vehicle entities."""
+
+    _attr_has_entity_name = True
+
+    def __init__(
+            self,
+            coordinator,
+            vehicle: Mazda6eVehicle,
+            vehicle_id: str,
+            description,
+    ):
+        super().__init__(coordinator)
+        self.entity_description = description
+        self.vehicle = vehicle
+        self.vehicle_id = vehicle_id
+        self._last_written: tuple | None = None
+
+        self._attr_unique_id = f"{vehicle.vehicle_id}_{description.key}"
+
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, vehicle_id)},
+            name=f"Mazda 6e - {vehicle.vehicle_id}",
+            serial_number=vehicle.vin,
+            manufacturer="Mazda",
+            model="6e",
+        )
+
+    @property
+    def status_block(self) -> str | None:
+        """condition/v2 block this entity reads, None if it needs none"""
+        return self.entity_description.value.block
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+
+        # only blocks of enabled entities are requested from the API
+        if self.status_block is not None:
+            self.async_on_remove(
+                self.coordinator.async_register_block(
+                    self.vehicle.vehicle_id, self.status_block
+                )
+            )
+
+    async def async_update(self) -> None:
+        """update_entity: refresh only this vehicle, shared with other entities asking at the same time."""
+        if not self.enabled:
+            return
+
+        await self.coordinator.async_request_vehicle_refresh(self.vehicle.vehicle_id)
+
+    @property
+    def available(self) -> bool:
+        # vehicles whose data exceeded the staleness budget are dropped from the data
+        return super().available and self.vehicle_data is not None
+
+    @property
+    def vehicle_data(self) -> dict | None:
+        return self.coordinator.data.get(self.vehicle.vehicle_id)
+
+    def _state_snapshot(self) -> Any:
+        """Values that end up in the state machine, used to skip unchanged writes."""
+        raise NotImplementedError
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if it changed since the last write."""
+        snapshot = (self.available, self._state_snapshot())
+        if snapshot == self._last_written:
+            return
+
+        self._last_written = snapshot
+        self.async_write_ha_state()
+
+
+@callback
+def async_add_vehicle_entities(
+        config_entry: ConfigEntry,
+        coordinator,
+        async_add_entities: AddConfigEntryEntitiesCallback,
+        create_entities: Callable[[Mazda6eVehicle, dict, set[str]], list[Mazda6eEntity]],
+) -> None:
+    """Add the entities of all vehicles now and those of values showing up in later refreshes.
+
+    create_entities is called with the vehicle, its coordinator data and the
+    description keys already added for it, and returns the new entities.
+    """
+    added: dict[int, set[str]] = {}
+
+    @callback
+    def _async_add_new_entities() -> None:
+        entities = []
+
+        for vehicle_id, data in (coordinator.data or {}).items():
+            coordinator.async_register_vehicle(vehicle_id)
+            keys = added.setdefault(vehicle_id, set())
+            new = create_entities(data["vehicle"], data, keys)
+            keys.update(entity.entity_description.key for entity in new)
+            entities.extend(new)
+
+        if entities:
+            async_add_entities(entities)
+
+    _async_add_new_entities()
+    config_entry.async_on_unload(coordinator.async_add_listener(_async_add_new_entities))
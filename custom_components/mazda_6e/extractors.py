@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Iterable
+
+from .models import VehicleStatus
+
+_LOGGER = logging.getLogger(__name__)
+
+# marker for values that are not part of the status payload
+MISSING = object()
+
+
+def _compile(path: tuple[str | int, ...]) -> Callable[[Any], Any]:
+    """Build a getter walking the given attributes/indices."""
+    getters = tuple(
+        itemgetter(key) if isinstance(key, int) else attrgetter(key)
+        for key in path
+    )
+
+    def get(obj):
+        for getter in getters:
+            obj = getter(obj)
+        return obj
+
+    return get
+
+
+@dataclass(frozen=True, slots=True)
+class Extractor:
+    """Reads one value from the parsed vehicle status.
+
+    path: attributes and tuple indices below VehicleStatus, the first one is the block
+    converter: applied to the value
+    """
+    path: tuple[str | int, ...]
+    converter: Callable[[Any], Any] | None = None
+    _get: Callable[[Any], Any] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "_get", _compile(self.path))
+
+    @property
+    def block(self) -> str:
+        """vechileCriteria block the value is read from"""
+        return VehicleStatus.criteria_block(self.path[0])
+
+    def extract(self, status: VehicleStatus) -> Any:
+        """Value at the path, MISSING if the payload has none.
+
+        The parsers turn absent keys into None, so None counts as missing too.
+        """
+        try:
+            value = self._get(status)
+            if value is not None and self.converter:
+                value = self.converter(value)
+            return MISSING if value is None else value
+        except (IndexError, TypeError, ValueError, AttributeError) as err:
+            _LOGGER.debug("Could not read %s: %s", self.path, err)
+            return MISSING
+
+
+def build_value_table(status: VehicleStatus | None, descriptions: Iterable) -> tuple[dict[str, Any], dict[str, dict]]:
+    """Evaluate all descriptions once into flat value and attribute tables.
+
+    Keys of descriptions whose value is missing in the status are left out.
+    """
+    values: dict[str, Any] = {}
+    attributes: dict[str, dict] = {}
+
+    if status is None:
+        return values, attributes
+
+    for description in descriptions:
+        value = description.value.extract(status)
+        if value is MISSING:
+            continue
+
+        values[description.key] = value
+
+        if description.attrs:
+            attributes[description.key] = {
+                name: attr_value
+                for name, extractor in description.attrs.items()
+                if (attr_value := extractor.extract(status)) is not MISSING
+            }
+
+    return values, attributes
@@ -0,0 +1,76 @@
+import logging
+import time
+from typing import Callable
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stops calling a failing backend for a cool-down period.
+
+    After `failure_threshold` consecutive failures the breaker opens and
+    requests are rejected until `cooldown` seconds passed. Then it is half
+    open: the next request is let through, its success closes the breaker,
+    its failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int, cooldown: float):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self._opened_at: float | None = None
+        self._listeners: list[Callable[[], None]] = []
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return STATE_CLOSED
+        if time.monotonic() - self._opened_at >= self.cooldown:
+            return STATE_HALF_OPEN
+        return STATE_OPEN
+
+    @property
+    def retry_in(self) -> float:
+        """Seconds until requests are let through again."""
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self.cooldown - (time.monotonic() - self._opened_at))
+
+    def allow_request(self) -> bool:
+        return self.state != STATE_OPEN
+
+    def record_success(self) -> None:
+        previous = self.state
+        self.failures = 0
+        self._opened_at = None
+
+        if previous != STATE_CLOSED:
+            _LOGGER.info("Mazda API reachable again, closing circuit breaker")
+            self._notify()
+
+    def record_failure(self) -> None:
+        self.failures += 1
+
+        if self.state == STATE_HALF_OPEN or (
+            self._opened_at is None and self.failures >= self.failure_threshold
+        ):
+            _LOGGER.warning(
+                "Mazda API failed %s times in a row, pausing requests for %ss",
+                self.failures,
+                self.cooldown,
+            )
+            self._opened_at = time.monotonic()
+            self._notify()
+
+    def add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Call listener on state changes until the returned callback is called."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def _notify(self) -> None:
+        for listener in list(self._listeners):
+            listener()
@@ -0,0 +1,112 @@
+from dataclasses import dataclass, field
+from typing import Callable
+
+# upper bounds of the latency histogram buckets, seconds
+LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 15.0)
+
+
+@dataclass(slots=True)
+class Histogram:
+    """Fixed bucket histogram, the last bucket counts everything above the bounds."""
+    bounds: tuple[float, ...] = LATENCY_BUCKETS
+    buckets: list[int] = field(default_factory=list)
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    last: float | None = None
+
+    def __post_init__(self):
+        self.buckets = [0] * (len(self.bounds) + 1)
+
+    def observe(self, value: float) -> None:
+        index = next((i for i, bound in enumerate(self.bounds) if value <= bound), len(self.bounds))
+        self.buckets[index] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        self.last = value
+
+    @property
+    def mean(self) -> float | None:
+        return self.total / self.count if self.count else None
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "max": self.max,
+            "last": self.last,
+            "buckets": {
+                f"le_{bound:g}": count for bound, count in zip(self.bounds, self.buckets)
+            } | {"inf": self.buckets[-1]},
+        }
+
+
+@dataclass(slots=True)
+class EndpointMetrics:
+    latency: Histogram = field(default_factory=Histogram)
+    errors: int = 0
+    bytes_received: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "latency": self.latency.as_dict(),
+            "errors": self.errors,
+            "bytes_received": self.bytes_received,
+        }
+
+
+class Metrics:
+    """Counters of the API client and the coordinator, kept in memory only.
+
+    Listeners are notified after every coordinator refresh, not per request.
+    """
+
+    def __init__(self):
+        self.endpoints: dict[str, EndpointMetrics] = {}
+        self.retries = 0
+        self.token_refreshes = 0
+        self.bytes_received = 0
+        self.refresh_duration = Histogram()
+        # time requests waited for the rate limiter
+        self.queue_wait = Histogram()
+        self._listeners: list[Callable[[], None]] = []
+
+    def record_request(self, endpoint: str, seconds: float, size: int, error: bool = False) -> None:
+        metrics = self.endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self.endpoints[endpoint] = EndpointMetrics()
+
+        metrics.latency.observe(seconds)
+        metrics.bytes_received += size
+        self.bytes_received += size
+        if error:
+            metrics.errors += 1
+
+    def record_refresh(self, seconds: float) -> None:
+        self.refresh_duration.observe(seconds)
+        for listener in list(self._listeners):
+            listener()
+
+    @property
+    def last_latency(self) -> float | None:
+        """Latency of the slowest endpoint in its last request."""
+        return max(
+            (m.latency.last for m in self.endpoints.values() if m.latency.last is not None),
+            default=None,
+        )
+
+    def add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Call listener after each refresh until the returned callback is called."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def as_dict(self) -> dict:
+        return {
+            "retries": self.retries,
+            "token_refreshes": self.token_refreshes,
+            "bytes_received": self.bytes_received,
+            "refresh_duration": self.refresh_duration.as_dict(),
+            "queue_wait": self.queue_wait.as_dict(),
+            "endpoints": {name: m.as_dict() for name, m in self.endpoints.items()},
+        }
@@ -0,0 +1,103 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+# lower values are served first
+PRIORITY_USER = 0  # logins, token refreshes and refreshes somebody asked for
+PRIORITY_POLL = 1  # scheduled status polls
+PRIORITY_BACKGROUND = 2  # housekeeping like refreshing the vehicle list
+
+
+class RateLimiter:
+    """Token bucket shared by all requests of an API client.
+
+    Up to `burst` requests pass at once, then `rate` requests per second.
+    Waiting requests are released by priority, in arrival order within a
+    priority. pause() stops releasing requests, e.g. for a Retry-After.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._order = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+
+    async def acquire(self, priority: int = PRIORITY_POLL) -> float:
+        """Wait for a token, returns the seconds waited."""
+        started = time.monotonic()
+        if not self._waiters and self._take(started):
+            return 0.0
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._order), future))
+        self._schedule()
+
+        # a cancelled waiter is skipped when it is its turn
+        await future
+        return time.monotonic() - started
+
+    def pause(self, seconds: float) -> None:
+        """Release no requests for the given seconds."""
+        _LOGGER.debug("Mazda API throttled, pausing requests for %.0fs", seconds)
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        # the bucket refills from the end of the pause
+        self._tokens = 0.0
+        self._updated = self._paused_until
+        self._schedule()
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    def _take(self, now: float) -> bool:
+        if now < self._paused_until:
+            return False
+
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+        if self._tokens < 1:
+            return False
+
+        self._tokens -= 1
+        return True
+
+    def _release(self) -> None:
+        self._timer = None
+        now = time.monotonic()
+
+        while self._waiters:
+            if self._waiters[0][2].done():
+                heapq.heappop(self._waiters)
+                continue
+            if not self._take(now):
+                break
+
+            heapq.heappop(self._waiters)[2].set_result(None)
+
+        self._schedule()
+
+    def _schedule(self) -> None:
+        """Wake up when the next waiter can get a token."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self._waiters:
+            return
+
+        now = time.monotonic()
+        tokens = min(self.burst, self._tokens + max(0.0, now - self._updated) * self.rate)
+        delay = max(
+            self._paused_until - now,
+            (1 - tokens) / self.rate if tokens < 1 else 0.0,
+        )
+        self._timer = asyncio.get_running_loop().call_later(max(delay, 0.0), self._release)
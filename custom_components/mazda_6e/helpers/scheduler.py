@@ -0,0 +1,123 @@
+import logging
+from dataclasses import dataclass, field
+
+from ..models import ChargeStatus, VehicleStatus
+
+_LOGGER = logging.getLogger(__name__)
+
+# timers may fire slightly early, treat vehicles due within this window as due
+DUE_TOLERANCE = 1.0
+
+
+@dataclass
+class _VehicleSchedule:
+    interval: float
+    next_due: float = 0.0
+    last_change: float = 0.0
+    snapshot: tuple | None = field(default=None, repr=False)
+    moving: bool = False
+
+
+class PollScheduler:
+    """Picks the next poll interval of each vehicle from its last status.
+
+    Vehicles that are charging or moving are polled with the minimum interval,
+    parked vehicles with the base interval until nothing changed for
+    `parked_grace_period` seconds, then with a doubling backoff up to the
+    maximum interval.
+    """
+
+    def __init__(self, base_interval: float, min_interval: float, max_interval: float, parked_grace_period: float):
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.parked_grace_period = parked_grace_period
+        self._vehicles: dict[int, _VehicleSchedule] = {}
+
+    def is_due(self, vehicle_id: int, now: float) -> bool:
+        schedule = self._vehicles.get(vehicle_id)
+        return schedule is None or schedule.next_due <= now + DUE_TOLERANCE
+
+    def next_interval(self, now: float) -> float:
+        """Seconds until the next vehicle is due, never below the minimum interval."""
+        if not self._vehicles:
+            return self.base_interval
+
+        next_due = min(schedule.next_due for schedule in self._vehicles.values())
+        return max(self.min_interval, min(self.max_interval, next_due - now))
+
+    def update(self, vehicle_id: int, status: VehicleStatus | None, now: float) -> float:
+        """Schedule the next poll of a vehicle after a successful fetch."""
+        schedule = self._vehicles.get(vehicle_id)
+        if schedule is None:
+            schedule = self._vehicles[vehicle_id] = _VehicleSchedule(
+                interval=self.base_interval, last_change=now
+            )
+
+        schedule.moving = _is_moving(status)
+
+        snapshot = _snapshot(status)
+        if snapshot != schedule.snapshot:
+            schedule.snapshot = snapshot
+            schedule.last_change = now
+
+        if _is_active(status):
+            interval = self.min_interval
+        elif now - schedule.last_change < self.parked_grace_period:
+            interval = self.base_interval
+        else:
+            interval = max(schedule.interval, self.base_interval) * 2
+
+        schedule.interval = max(self.min_interval, min(self.max_interval, interval))
+        schedule.next_due = now + schedule.interval
+
+        _LOGGER.debug("Next poll of vehicle %s in %ss", vehicle_id, schedule.interval)
+        return schedule.interval
+
+    def is_moving(self, vehicle_id: int) -> bool:
+        schedule = self._vehicles.get(vehicle_id)
+        return schedule is not None and schedule.moving
+
+    def changed_recently(self, vehicle_id: int, now: float, within: float) -> bool:
+        """Whether doors, windows or the charge connection changed in the last `within` seconds."""
+        schedule = self._vehicles.get(vehicle_id)
+        return schedule is not None and now - schedule.last_change < within
+
+    def postpone(self, vehicle_id: int, now: float) -> None:
+        """Retry a vehicle whose fetch failed after the base interval."""
+        schedule = self._vehicles.setdefault(
+            vehicle_id, _VehicleSchedule(interval=self.base_interval, last_change=now)
+        )
+        schedule.next_due = now + self.base_interval
+
+    def retain(self, vehicle_ids) -> None:
+        """Forget vehicles that are no longer part of the account."""
+        for vehicle_id in set(self._vehicles) - set(vehicle_ids):
+            del self._vehicles[vehicle_id]
+
+
+def _is_active(status: VehicleStatus | None) -> bool:
+    """True while the vehicle is charging or moving."""
+    if status is None:
+        return False
+
+    if status.charge and status.charge.charge_status == ChargeStatus.CHARGING:
+        return True
+
+    return _is_moving(status)
+
+
+def _is_moving(status: VehicleStatus | None) -> bool:
+    return bool(status and status.driving and status.driving.speed)
+
+
+def _snapshot(status: VehicleStatus | None) -> tuple | None:
+    """State used to detect that somebody interacted with the vehicle."""
+    if status is None:
+        return None
+
+    return (
+        status.door,
+        status.window,
+        status.charge.charge_con_status if status.charge else None,
+    )
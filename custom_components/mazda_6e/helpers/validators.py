@@ -3,9 +3,7 @@ import logging
 _LOGGER = logging.getLogger(__name__)
 
 
-def speed_value(data):
-    speed = data["status"]["vehicleStatus"].get("speed")
-
+def speed_value(speed):
     if speed is None:
         return None
 
@@ -1,5 +1,10 @@
-from dataclasses import dataclass
+from __future__ import annotations
+
+from dataclasses import dataclass, fields, replace
 from enum import IntEnum
+from typing import Any, ClassVar
+
+from .helpers.validators import speed_value, temperature
 
 
 @dataclass
@@ -22,11 +27,15 @@ class ChargeStatus(IntEnum):
     PAUSED = 7
 
     @classmethod
-    def safe_name(cls, value: int | None) -> str:
+    def safe(cls, value: int | None) -> ChargeStatus:
         try:
-            return cls(value).name
+            return cls(value)
         except (ValueError, TypeError):
-            return "UNKNOWN"
+            return cls.UNKNOWN
+
+    @classmethod
+    def safe_name(cls, value: int | None) -> str:
+        return cls.safe(value).name
 
 
 class SeatStatusMode(IntEnum):
@@ -36,8 +45,240 @@ class SeatStatusMode(IntEnum):
     FAN = 2
 
     @classmethod
-    def safe_name(cls, value: int | None) -> str:
+    def safe(cls, value: int | None) -> SeatStatusMode:
         try:
-            return cls(value).name
+            return cls(value)
         except (ValueError, TypeError):
-            return "UNKNOWN"
+            return cls.UNKNOWN
+
+    @classmethod
+    def safe_name(cls, value: int | None) -> str:
+        return cls.safe(value).name
+
+
+# ----------------------------------------------------------------------
+# Vehicle status, parsed once per poll from the condition/v2 payload
+# ----------------------------------------------------------------------
+def _block(raw: dict, key: str) -> dict:
+    value = raw.get(key)
+    return value if isinstance(value, dict) else {}
+
+
+@dataclass(frozen=True, slots=True)
+class DrivingStatus:
+    """vehicleStatus block"""
+    soc: int | None
+    drv_mileage: float | None
+    total_mileage: float | None
+    speed: float | None
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> DrivingStatus:
+        return cls(
+            soc=raw.get("soc"),
+            drv_mileage=raw.get("drvMileage"),
+            total_mileage=raw.get("totalMileage"),
+            speed=speed_value(raw.get("speed")),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ChargeState:
+    """charge block"""
+    charge_current: float | None
+    remain_charge_time: int | None
+    charge_status: ChargeStatus
+    charge_con_status: int | None
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> ChargeState:
+        return cls(
+            charge_current=raw.get("chargeCurrent"),
+            remain_charge_time=raw.get("remainChargeTime"),
+            charge_status=ChargeStatus.safe(raw.get("chargeStatus")),
+            charge_con_status=raw.get("chargeConStatus"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class TireState:
+    """tire block, pressures in kPa"""
+    left_front: float | None
+    right_front: float | None
+    left_back: float | None
+    right_back: float | None
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> TireState:
+        return cls(
+            left_front=_block(raw, "leftFront").get("pressure"),
+            right_front=_block(raw, "rightFront").get("pressure"),
+            left_back=_block(raw, "leftBack").get("pressure"),
+            right_back=_block(raw, "rightBack").get("pressure"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Seat:
+    mode: SeatStatusMode
+    level: int | None
+    heat_status: int | None
+    vent_status: int | None
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> Seat | None:
+        if not raw:
+            return None
+
+        return cls(
+            mode=SeatStatusMode.safe(raw.get("mode")),
+            level=raw.get("level"),
+            heat_status=raw.get("heatStatus"),
+            vent_status=raw.get("ventStatus"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class SeatState:
+    """seat block"""
+    left_front: Seat | None
+    right_front: Seat | None
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> SeatState:
+        return cls(
+            left_front=Seat.from_dict(_block(raw, "leftFront")),
+            right_front=Seat.from_dict(_block(raw, "rightFront")),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class HvacState:
+    """hvac block, temperatures in °C"""
+    inside_temp: float | None
+    outside_temp: float | None
+    inside_humidity: float | None
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> HvacState:
+        return cls(
+            inside_temp=temperature(raw.get("insideTemp")),
+            outside_temp=temperature(raw.get("outsideTemp")),
+            inside_humidity=raw.get("insideHumidity"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class DoorState:
+    """door block"""
+    doors: tuple[int, ...]
+    trunk: int | None
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> DoorState:
+        return cls(
+            doors=tuple(raw.get("doors") or ()),
+            trunk=raw.get("trunk"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class WindowState:
+    """window block"""
+    windows: tuple[int, ...]
+    sunroof: int | None
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> WindowState:
+        return cls(
+            windows=tuple(raw.get("windows") or ()),
+            sunroof=raw.get("sunroof"),
+        )
+
+
+def _coordinate(raw: dict, *keys: str) -> float | None:
+    for key in keys:
+        try:
+            return float(raw[key])
+        except (KeyError, TypeError, ValueError):
+            continue
+    return None
+
+
+@dataclass(frozen=True, slots=True)
+class LocationState:
+    """location block, WGS84 degrees"""
+    latitude: float | None
+    longitude: float | None
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> LocationState:
+        # field names of the block are not documented, accept the usual spellings
+        return cls(
+            latitude=_coordinate(raw, "latitude", "lat"),
+            longitude=_coordinate(raw, "longitude", "lng", "lon"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class VehicleStatus:
+    """Parsed condition/v2 payload, blocks that were not fetched are None."""
+    driving: DrivingStatus | None = None
+    charge: ChargeState | None = None
+    tire: TireState | None = None
+    seat: SeatState | None = None
+    hvac: HvacState | None = None
+    door: DoorState | None = None
+    window: WindowState | None = None
+    location: LocationState | None = None
+
+    # attribute -> (vechileCriteria block, parser)
+    BLOCKS: ClassVar[dict[str, tuple[str, Any]]] = {
+        "driving": ("vehicleStatus", DrivingStatus),
+        "charge": ("charge", ChargeState),
+        "tire": ("tire", TireState),
+        "seat": ("seat", SeatState),
+        "hvac": ("hvac", HvacState),
+        "door": ("door", DoorState),
+        "window": ("window", WindowState),
+        "location": ("location", LocationState),
+    }
+
+    @classmethod
+    def from_dict(cls, raw: dict | None, blocks: set[str] | None = None) -> VehicleStatus:
+        """Parse the payload, limited to the requested blocks if given."""
+        raw = raw or {}
+        parsed = {}
+
+        for name, (block, block_cls) in cls.BLOCKS.items():
+            if blocks is not None and block not in blocks:
+                continue
+            if isinstance(raw.get(block), dict):
+                parsed[name] = block_cls.from_dict(raw[block])
+
+        return cls(**parsed)
+
+    def merge(self, previous: VehicleStatus | None) -> VehicleStatus:
+        """Fill blocks missing in this status from a previous one."""
+        if previous is None:
+            return self
+
+        missing = {
+            field.name: getattr(previous, field.name)
+            for field in fields(self)
+            if getattr(self, field.name) is None
+        }
+        return replace(self, **missing) if missing else self
+
+    def available_blocks(self) -> set[str]:
+        """vechileCriteria blocks contained in this status"""
+        return {
+            block
+            for name, (block, _) in self.BLOCKS.items()
+            if getattr(self, name) is not None
+        }
+
+    @classmethod
+    def criteria_block(cls, name: str) -> str:
+        """vechileCriteria key of a status attribute"""
+        return cls.BLOCKS[name][0]
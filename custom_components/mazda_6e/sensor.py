@@ -2,23 +2,25 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
-from typing import Callable, Any
+from typing import Any, Callable
 
 from homeassistant.components.sensor import (
+    RestoreSensor,
     SensorEntity,
     SensorEntityDescription,
     SensorDeviceClass,
     SensorStateClass
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfLength, PERCENTAGE, UnitOfPressure, UnitOfSpeed, UnitOfElectricCurrent, UnitOfTime, UnitOfTemperature
+from homeassistant.const import UnitOfLength, PERCENTAGE, UnitOfPressure, UnitOfSpeed, UnitOfElectricCurrent, UnitOfEnergy, UnitOfPower, UnitOfTime, UnitOfInformation, UnitOfTemperature, EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 
+from .charging import ChargeEnergyEstimator
 from .const import DOMAIN
-from .helpers.validators import speed_value, temperature
+from .entity import Mazda6eEntity, async_add_vehicle_entities
+from .extractors import Extractor
+from .helpers.circuit_breaker import STATE_CLOSED, STATE_OPEN, STATE_HALF_OPEN
 from .models import Mazda6eVehicle, ChargeStatus, SeatStatusMode
 
 _LOGGER = logging.getLogger(__name__)
@@ -27,8 +29,26 @@ _LOGGER = logging.getLogger(__name__)
 @dataclass(frozen=True, kw_only=True)
 class Mazda6eSensorDescription(SensorEntityDescription):
     """Description of a Mazda 6e Sensor."""
-    value_fn: Callable[[dict[str, Any]], Any]
-    attrs_fn: Callable[[dict], dict] | None = None
+    value: Extractor
+    attrs: dict[str, Extractor] | None = None
+
+
+@dataclass(frozen=True, kw_only=True)
+class Mazda6eDiagnosticSensorDescription(SensorEntityDescription):
+    """Description of a Mazda 6e sensor reporting the state of the integration.
+
+    value_fn/attrs_fn are called with the coordinator and the vehicle id.
+    """
+    value_fn: Callable[[Any, int], Any]
+    attrs_fn: Callable[[Any, int], dict] | None = None
+
+
+@dataclass(frozen=True, kw_only=True)
+class Mazda6eChargingSensorDescription(SensorEntityDescription):
+    """Description of a Mazda 6e sensor derived from the charging samples."""
+    value_fn: Callable[[ChargeEnergyEstimator], float]
+    # ChargeEnergyEstimator.restore argument the last state is restored into
+    restore_key: str | None = None
 
 
 SENSOR_TYPES: tuple[Mazda6eSensorDescription, ...] = (
@@ -38,7 +58,7 @@ SENSOR_TYPES: tuple[Mazda6eSensorDescription, ...] = (
         native_unit_of_measurement=PERCENTAGE,
         device_class=SensorDeviceClass.BATTERY,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data["status"]["vehicleStatus"]["soc"],
+        value=Extractor(("driving", "soc")),
     ),
     Mazda6eSensorDescription(
         key="remaining_driving_range",
@@ -47,7 +67,7 @@ SENSOR_TYPES: tuple[Mazda6eSensorDescription, ...] = (
         native_unit_of_measurement=UnitOfLength.KILOMETERS,
         device_class=SensorDeviceClass.DISTANCE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data["status"]["vehicleStatus"]["drvMileage"],
+        value=Extractor(("driving", "drv_mileage")),
     ),
     Mazda6eSensorDescription(
         key="odometer",
@@ -56,7 +76,7 @@ SENSOR_TYPES: tuple[Mazda6eSensorDescription, ...] = (
         native_unit_of_measurement=UnitOfLength.KILOMETERS,
         device_class=SensorDeviceClass.DISTANCE,
         state_class=SensorStateClass.TOTAL_INCREASING,
-        value_fn=lambda data: data["status"]["vehicleStatus"]["totalMileage"],
+        value=Extractor(("driving", "total_mileage")),
     ),
     Mazda6eSensorDescription(
         key="current_speed",
@@ -65,7 +85,7 @@ SENSOR_TYPES: tuple[Mazda6eSensorDescription, ...] = (
         native_unit_of_measurement=UnitOfSpeed.KILOMETERS_PER_HOUR,
         device_class=SensorDeviceClass.SPEED,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: speed_value(data)
+        value=Extractor(("driving", "speed")),
     ),
     Mazda6eSensorDescription(
         key="front_left_tire_pressure",
@@ -75,7 +95,7 @@ SENSOR_TYPES: tuple[Mazda6eSensorDescription, ...] = (
         device_class=SensorDeviceClass.PRESSURE,
         suggested_unit_of_measurement=UnitOfPressure.BAR,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data["status"]["tire"]["leftFront"]["pressure"],
+        value=Extractor(("tire", "left_front")),
     ),
     Mazda6eSensorDescription(
         key="front_right_tire_pressure",
@@ -85,7 +105,7 @@ SENSOR_TYPES: tuple[Mazda6eSensorDescription, ...] = (
         suggested_unit_of_measurement=UnitOfPressure.BAR,
         device_class=SensorDeviceClass.PRESSURE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data["status"]["tire"]["rightFront"]["pressure"],
+        value=Extractor(("tire", "right_front")),
     ),
     Mazda6eSensorDescription(
         key="rear_left_tire_pressure",
@@ -95,7 +115,7 @@ SENSOR_TYPES: tuple[Mazda6eSensorDescription, ...] = (
         suggested_unit_of_measurement=UnitOfPressure.BAR,
         device_class=SensorDeviceClass.PRESSURE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data["status"]["tire"]["leftBack"]["pressure"],
+        value=Extractor(("tire", "left_back")),
     ),
     Mazda6eSensorDescription(
         key="rear_right_tire_pressure",
@@ -105,7 +125,7 @@ SENSOR_TYPES: tuple[Mazda6eSensorDescription, ...] = (
         suggested_unit_of_measurement=UnitOfPressure.BAR,
         device_class=SensorDeviceClass.PRESSURE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data["status"]["tire"]["rightBack"]["pressure"],
+        value=Extractor(("tire", "right_back")),
     ),
     Mazda6eSensorDescription(
         key="chargeCurrent",
@@ -114,7 +134,7 @@ SENSOR_TYPES: tuple[Mazda6eSensorDescription, ...] = (
         native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
         device_class=SensorDeviceClass.CURRENT,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data["status"]["charge"]["chargeCurrent"],
+        value=Extractor(("charge", "charge_current")),
     ),
     Mazda6eSensorDescription(
         key="remainChargeTime",
@@ -123,7 +143,7 @@ SENSOR_TYPES: tuple[Mazda6eSensorDescription, ...] = (
         native_unit_of_measurement=UnitOfTime.MINUTES,
         device_class=SensorDeviceClass.DURATION,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data["status"]["charge"]["remainChargeTime"],
+        value=Extractor(("charge", "remain_charge_time")),
     ),
     Mazda6eSensorDescription(
         key="chargeStatus",
@@ -131,31 +151,31 @@ SENSOR_TYPES: tuple[Mazda6eSensorDescription, ...] = (
         icon="mdi:state-machine",
         device_class=SensorDeviceClass.ENUM,
         options=[e.name for e in ChargeStatus],
-        value_fn=lambda data: ChargeStatus.safe_name(data["status"]["charge"].get("chargeStatus"))
+        value=Extractor(("charge", "charge_status", "name")),
     ),
     Mazda6eSensorDescription(
         key="seat_status_front_left",
         translation_key="seat_status_front_left",
         device_class=SensorDeviceClass.ENUM,
         options=[e.name for e in SeatStatusMode],
-        value_fn=lambda data: SeatStatusMode.safe_name(data["status"]["seat"]['leftFront']['mode']),
-        attrs_fn=lambda data: {
-            "level": data["status"]["seat"]["leftFront"]["level"],
-            "heat_status": data["status"]["seat"]["leftFront"]["heatStatus"],
-            "vent_status": data["status"]["seat"]["leftFront"]["ventStatus"]
-        }
+        value=Extractor(("seat", "left_front", "mode", "name")),
+        attrs={
+            "level": Extractor(("seat", "left_front", "level")),
+            "heat_status": Extractor(("seat", "left_front", "heat_status")),
+            "vent_status": Extractor(("seat", "left_front", "vent_status")),
+        },
     ),
     Mazda6eSensorDescription(
         key="seat_status_front_right",
         translation_key="seat_status_front_right",
         device_class=SensorDeviceClass.ENUM,
         options=[e.name for e in SeatStatusMode],
-        value_fn=lambda data: SeatStatusMode.safe_name(data["status"]["seat"]['rightFront']['mode']),
-        attrs_fn=lambda data: {
-            "level": data["status"]["seat"]["rightFront"]["level"],
-            "heat_status": data["status"]["seat"]["rightFront"]["heatStatus"],
-            "vent_status": data["status"]["seat"]["rightFront"]["ventStatus"]
-        }
+        value=Extractor(("seat", "right_front", "mode", "name")),
+        attrs={
+            "level": Extractor(("seat", "right_front", "level")),
+            "heat_status": Extractor(("seat", "right_front", "heat_status")),
+            "vent_status": Extractor(("seat", "right_front", "vent_status")),
+        },
     ),
     Mazda6eSensorDescription(
         key="temperature_inside",
@@ -164,7 +184,7 @@ SENSOR_TYPES: tuple[Mazda6eSensorDescription, ...] = (
         device_class=SensorDeviceClass.TEMPERATURE,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: temperature(data["status"]["hvac"]['insideTemp'])
+        value=Extractor(("hvac", "inside_temp")),
     ),
     Mazda6eSensorDescription(
         key="temperature_outside",
@@ -173,7 +193,7 @@ SENSOR_TYPES: tuple[Mazda6eSensorDescription, ...] = (
         device_class=SensorDeviceClass.TEMPERATURE,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: temperature(data["status"]["hvac"]['outsideTemp'])
+        value=Extractor(("hvac", "outside_temp")),
     ),
     Mazda6eSensorDescription(
         key="humidity_inside",
@@ -182,73 +202,215 @@ SENSOR_TYPES: tuple[Mazda6eSensorDescription, ...] = (
         device_class=SensorDeviceClass.HUMIDITY,
         native_unit_of_measurement=PERCENTAGE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data["status"]["hvac"]['insideHumidity']
+        value=Extractor(("hvac", "inside_humidity")),
     )
 )
 
 
+CHARGING_SENSOR_TYPES: tuple[Mazda6eChargingSensorDescription, ...] = (
+    Mazda6eChargingSensorDescription(
+        key="charging_power",
+        translation_key="charging_power",
+        icon="mdi:flash",
+        native_unit_of_measurement=UnitOfPower.KILO_WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        value_fn=lambda estimator: estimator.power,
+    ),
+    Mazda6eChargingSensorDescription(
+        key="charging_session_energy",
+        translation_key="charging_session_energy",
+        icon="mdi:battery-charging",
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        suggested_display_precision=2,
+        value_fn=lambda estimator: estimator.session_energy,
+        restore_key="session_energy",
+    ),
+    Mazda6eChargingSensorDescription(
+        key="charging_total_energy",
+        translation_key="charging_total_energy",
+        icon="mdi:battery-charging-high",
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        suggested_display_precision=2,
+        value_fn=lambda estimator: estimator.total_energy,
+        restore_key="total_energy",
+    ),
+)
+
+
+DIAGNOSTIC_SENSOR_TYPES: tuple[Mazda6eDiagnosticSensorDescription, ...] = (
+    Mazda6eDiagnosticSensorDescription(
+        key="api_circuit_breaker",
+        translation_key="api_circuit_breaker",
+        icon="mdi:electric-switch",
+        device_class=SensorDeviceClass.ENUM,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        options=[STATE_CLOSED, STATE_OPEN, STATE_HALF_OPEN],
+        value_fn=lambda coordinator, vehicle_id: coordinator.api.circuit_breaker.state,
+        attrs_fn=lambda coordinator, vehicle_id: {
+            "consecutive_failures": coordinator.api.circuit_breaker.failures,
+            "retry_in": round(coordinator.api.circuit_breaker.retry_in),
+        },
+    ),
+    Mazda6eDiagnosticSensorDescription(
+        key="last_update",
+        translation_key="last_update",
+        icon="mdi:update",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda coordinator, vehicle_id: max(
+            coordinator.block_fetched_at(vehicle_id).values(), default=None
+        ),
+        attrs_fn=lambda coordinator, vehicle_id: {
+            f"{block}_fetched": fetched_at.isoformat()
+            for block, fetched_at in coordinator.block_fetched_at(vehicle_id).items()
+        },
+    ),
+    Mazda6eDiagnosticSensorDescription(
+        key="refresh_duration",
+        translation_key="refresh_duration",
+        icon="mdi:timer-outline",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        suggested_display_precision=2,
+        value_fn=lambda coordinator, vehicle_id: coordinator.api.metrics.refresh_duration.last,
+        attrs_fn=lambda coordinator, vehicle_id: {
+            "refreshes": coordinator.api.metrics.refresh_duration.count,
+            "mean": coordinator.api.metrics.refresh_duration.mean,
+            "max": coordinator.api.metrics.refresh_duration.max,
+        },
+    ),
+    Mazda6eDiagnosticSensorDescription(
+        key="api_latency",
+        translation_key="api_latency",
+        icon="mdi:timer-sand",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        suggested_display_precision=2,
+        value_fn=lambda coordinator, vehicle_id: coordinator.api.metrics.last_latency,
+        attrs_fn=lambda coordinator, vehicle_id: {
+            f"{endpoint}_mean": metrics.latency.mean
+            for endpoint, metrics in coordinator.api.metrics.endpoints.items()
+        },
+    ),
+    Mazda6eDiagnosticSensorDescription(
+        key="api_queue_wait",
+        translation_key="api_queue_wait",
+        icon="mdi:timer-pause-outline",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        suggested_display_precision=2,
+        value_fn=lambda coordinator, vehicle_id: coordinator.api.metrics.queue_wait.last,
+        attrs_fn=lambda coordinator, vehicle_id: {
+            "mean": coordinator.api.metrics.queue_wait.mean,
+            "max": coordinator.api.metrics.queue_wait.max,
+            "queued": coordinator.api.rate_limiter.queued,
+        },
+    ),
+    Mazda6eDiagnosticSensorDescription(
+        key="api_retries",
+        translation_key="api_retries",
+        icon="mdi:reload-alert",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator, vehicle_id: coordinator.api.metrics.retries,
+        attrs_fn=lambda coordinator, vehicle_id: {
+            "token_refreshes": coordinator.api.metrics.token_refreshes,
+        },
+    ),
+    Mazda6eDiagnosticSensorDescription(
+        key="api_bytes_received",
+        translation_key="api_bytes_received",
+        icon="mdi:download-network",
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator, vehicle_id: coordinator.api.metrics.bytes_received,
+    ),
+)
+
+
 async def async_setup_entry(
         hass: HomeAssistant,
         entry: ConfigEntry,
         async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     coordinator = hass.data[DOMAIN][entry.entry_id]
-    entities = []
 
-    for vehicle_id, data in coordinator.data.items():
-        vehicle: Mazda6eVehicle = data["vehicle"]
+    def create_entities(vehicle: Mazda6eVehicle, data: dict, added: set[str]) -> list[Mazda6eEntity]:
+        entities = []
+        vehicle_id = f"{vehicle.vehicle_id}"
 
         for description in SENSOR_TYPES:
-            try:
-                description.value_fn(data)
-            except Exception:
+            if description.key in added or description.key not in data["values"]:
                 continue
 
             entities.append(
                 Mazda6eSensor(
                     coordinator=coordinator,
                     vehicle=vehicle,
-                    vehicle_id=f"{vehicle.vehicle_id}",
+                    vehicle_id=vehicle_id,
+                    description=description,
+                )
+            )
+
+        # derived from chargeCurrent, only for vehicles reporting it
+        if "chargeCurrent" in data["values"]:
+            for description in CHARGING_SENSOR_TYPES:
+                if description.key in added:
+                    continue
+
+                entities.append(
+                    Mazda6eChargingSensor(
+                        coordinator=coordinator,
+                        vehicle=vehicle,
+                        vehicle_id=vehicle_id,
+                        description=description,
+                    )
+                )
+
+        for description in DIAGNOSTIC_SENSOR_TYPES:
+            if description.key in added:
+                continue
+
+            entities.append(
+                Mazda6eDiagnosticSensor(
+                    coordinator=coordinator,
+                    vehicle=vehicle,
+                    vehicle_id=vehicle_id,
                     description=description,
                 )
             )
 
-    async_add_entities(entities)
+        return entities
 
+    async_add_vehicle_entities(entry, coordinator, async_add_entities, create_entities)
 
-class Mazda6eSensor(CoordinatorEntity, SensorEntity):
+
+class Mazda6eSensor(Mazda6eEntity, SensorEntity):
     """Mazda 6e base sensor."""
 
-    _attr_has_entity_name = True
     entity_description: Mazda6eSensorDescription
 
-    def __init__(
-            self,
-            coordinator,
-            vehicle: Mazda6eVehicle,
-            vehicle_id: str,
-            description: Mazda6eSensorDescription,
-    ):
-        super().__init__(coordinator)
-        self.entity_description = description
-        self.vehicle = vehicle
-        self.vehicle_id = vehicle_id
-
-        _LOGGER.debug("Mazda6eSensor: '%s', '%s'", self.entity_description, self.vehicle)
-
-        self._attr_unique_id = f"{vehicle.vehicle_id}_{description.key}"
-
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, vehicle_id)},
-            name=f"Mazda 6e - {vehicle.vehicle_id}",
-            serial_number=vehicle.vin,
-            manufacturer="Mazda",
-            model="6e",
-        )
-
-    @property
-    def vehicle_data(self) -> dict | None:
-        return self.coordinator.data.get(self.vehicle.vehicle_id)
+    def _state_snapshot(self):
+        return self.native_value, self.extra_state_attributes
 
     @property
     def native_value(self):
@@ -256,29 +418,90 @@ class Mazda6eSensor(CoordinatorEntity, SensorEntity):
         if not data:
             return None
 
-        try:
-            return self.entity_description.value_fn(data)
-        except Exception as err:
-            _LOGGER.warning(
-                "Mazda6eSensor '%s' could not read value: %s",
-                self.entity_description.key,
-                err,
-            )
-            return None
+        return data["values"].get(self.entity_description.key)
 
     @property
     def extra_state_attributes(self) -> dict:
         """Return extra attributes for the sensor."""
-        if not self.entity_description.attrs_fn:
+        data = self.vehicle_data
+        if not data:
             return {}
 
+        return data["attributes"].get(self.entity_description.key, {})
+
+
+class Mazda6eChargingSensor(Mazda6eEntity, RestoreSensor):
+    """Charging power and energy estimated from the polled charge current."""
+
+    entity_description: Mazda6eChargingSensorDescription
+
+    @property
+    def status_block(self) -> str | None:
+        return "charge"
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+
+        # energy totals survive restarts, they are integrated on top of the restored value
+        if self.entity_description.restore_key is None:
+            return
+        if (last := await self.async_get_last_sensor_data()) is None:
+            return
+
         try:
-            data = self.coordinator.data[self.vehicle.vehicle_id]
-            return self.entity_description.attrs_fn(data)
-        except Exception as err:
-            _LOGGER.debug(
-                "Failed to compute attributes for %s: %s",
-                self.entity_id,
-                err,
-            )
+            restored = float(last.native_value)
+        except (TypeError, ValueError):
+            return
+
+        self._estimator.restore(**{self.entity_description.restore_key: restored})
+
+    @property
+    def _estimator(self) -> ChargeEnergyEstimator:
+        return self.coordinator.energy_estimator(self.vehicle.vehicle_id)
+
+    def _state_snapshot(self):
+        return self.native_value
+
+    @property
+    def native_value(self):
+        return round(self.entity_description.value_fn(self._estimator), 3)
+
+
+class Mazda6eDiagnosticSensor(Mazda6eEntity, SensorEntity):
+    """Sensor reporting the state of the integration itself."""
+
+    entity_description: Mazda6eDiagnosticSensorDescription
+
+    @property
+    def status_block(self) -> str | None:
+        return None
+
+    @property
+    def available(self) -> bool:
+        # stays available while the API is failing, that is when it matters
+        return True
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+
+        self.async_on_remove(
+            self.coordinator.api.circuit_breaker.add_listener(self._handle_coordinator_update)
+        )
+        # metrics change with every refresh, also when the data does not
+        self.async_on_remove(
+            self.coordinator.api.metrics.add_listener(self._handle_coordinator_update)
+        )
+
+    def _state_snapshot(self):
+        return self.native_value, self.extra_state_attributes
+
+    @property
+    def native_value(self):
+        return self.entity_description.value_fn(self.coordinator, self.vehicle.vehicle_id)
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        if not self.entity_description.attrs_fn:
             return {}
+
+        return self.entity_description.attrs_fn(self.coordinator, self.vehicle.vehicle_id)
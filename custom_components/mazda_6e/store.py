@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .charging import ChargingSession
+from .const import DOMAIN, STATUS_CACHE_SAVE_DELAY
+from .models import Mazda6eVehicle
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+
+class StatusCache:
+    """Last good coordinator data on disk, so entities have values right after a restart.
+
+    Only the vehicle, its evaluated value/attribute tables and its open
+    charging session are stored, the parsed status is rebuilt by the next fetch.
+    """
+
+    def __init__(self, hass: HomeAssistant, account_key: str):
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.status_{account_key[:16]}"
+        )
+
+    async def async_load(self) -> dict[int, dict] | None:
+        try:
+            stored = await self._store.async_load()
+        except Exception as err:  # noqa: BLE001 - a broken cache must not break the setup
+            _LOGGER.warning("Could not load the cached vehicle status: %s", err)
+            return None
+
+        if not stored:
+            return None
+
+        try:
+            return {
+                int(vehicle_id): {
+                    "vehicle": Mazda6eVehicle(**entry["vehicle"]),
+                    "status": None,
+                    "values": entry["values"],
+                    "attributes": entry["attributes"],
+                    "fetched": {
+                        block: dt_util.parse_datetime(fetched_at)
+                        for block, fetched_at in entry.get("fetched", {}).items()
+                    },
+                    "charging_session": (
+                        ChargingSession.from_dict(session)
+                        if (session := entry.get("charging_session"))
+                        else None
+                    ),
+                }
+                for vehicle_id, entry in stored["vehicles"].items()
+            }
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.warning("Ignoring invalid cached vehicle status: %s", err)
+            return None
+
+    @callback
+    def async_schedule_save(self, data: dict[int, dict]) -> None:
+        """Write the data after STATUS_CACHE_SAVE_DELAY, later calls replace it."""
+        self._store.async_delay_save(lambda: _serialize(data), STATUS_CACHE_SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
+
+
+def _serialize(data: dict[int, dict]) -> dict[str, Any]:
+    return {
+        "vehicles": {
+            str(vehicle_id): {
+                "vehicle": asdict(entry["vehicle"]),
+                "values": entry["values"],
+                "attributes": entry["attributes"],
+                "fetched": {
+                    block: fetched_at.isoformat()
+                    for block, fetched_at in entry.get("fetched", {}).items()
+                },
+                "charging_session": (
+                    session.as_dict() if (session := entry.get("charging_session")) else None
+                ),
+            }
+            for vehicle_id, entry in data.items()
+        }
+    }
@@ -0,0 +1,105 @@
+"""Fixtures of the Mazda 6e tests, wired to the fake gateway."""
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator, Generator
+from unittest.mock import patch
+
+import aiohttp
+import pytest
+from aiohttp.test_utils import TestServer
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.mazda_6e.api import Mazda6EApi
+from custom_components.mazda_6e.const import DOMAIN
+from custom_components.mazda_6e.coordinator import Mazda6eCoordinator
+from custom_components.mazda_6e.helpers.rate_limiter import RateLimiter
+
+from .fake_gateway import FakeGateway
+
+DEVICE_ID = "0123456789abcdef"
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Load the integration from custom_components in every test."""
+    yield
+
+
+@pytest.fixture
+async def gateway(socket_enabled: None) -> AsyncGenerator[FakeGateway]:
+    """Fake gateway listening on localhost, tests adjust its knobs.
+
+    The plugin blocks sockets, socket_enabled opens them for the test server.
+    """
+    gateway = FakeGateway()
+    server = TestServer(gateway.app)
+    await server.start_server()
+    gateway.url = str(server.make_url("/"))
+
+    yield gateway
+
+    await server.close()
+
+
+@pytest.fixture
+async def api(gateway: FakeGateway) -> AsyncGenerator[Mazda6EApi]:
+    """API client holding the current tokens of the fake gateway."""
+    async with aiohttp.ClientSession() as session:
+        api = Mazda6EApi(session, gateway.token, gateway.refresh, DEVICE_ID, base_url=gateway.url)
+        # the production rate limit would dominate every measurement
+        api.rate_limiter = RateLimiter(rate=1000, burst=1000)
+        yield api
+
+
+@pytest.fixture
+async def coordinator(hass: HomeAssistant, api: Mazda6EApi) -> AsyncGenerator[Mazda6eCoordinator]:
+    """Coordinator polling the fake gateway, refreshed by the tests only."""
+    coordinator = Mazda6eCoordinator(hass, None, api)
+
+    yield coordinator
+
+    await coordinator.async_shutdown()
+
+
+@pytest.fixture
+def config_entry(hass: HomeAssistant, gateway: FakeGateway) -> MockConfigEntry:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Mazda 6e",
+        data={
+            "token": gateway.token,
+            "refresh": gateway.refresh,
+            "email_enc": "email",
+            "deviceid": DEVICE_ID,
+        },
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+@pytest.fixture
+def patch_api(gateway: FakeGateway) -> Generator[None]:
+    """Point the API clients created by the integration at the fake gateway."""
+
+    def create_api(*args, **kwargs) -> Mazda6EApi:
+        api = Mazda6EApi(*args, base_url=gateway.url, **kwargs)
+        api.rate_limiter = RateLimiter(rate=1000, burst=1000)
+        return api
+
+    with patch("custom_components.mazda_6e.account.Mazda6EApi", create_api):
+        yield
+
+
+@pytest.fixture
+async def init_integration(
+        recorder_mock, hass: HomeAssistant, patch_api: None, config_entry: MockConfigEntry
+) -> AsyncGenerator[MockConfigEntry]:
+    """Set up the config entry with its API client pointed at the fake gateway."""
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    yield config_entry
+
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,246 @@
+"""Local stand-in for the cma-app-gw gateway, so the API can be driven offline.
+
+Serves login, refresh-token, vehicles and condition/v2 for a configurable
+number of synthetic vehicles. The condition payload is replayed from a
+recorded response in fixtures/. Latency and failures can be injected per
+endpoint, every request is counted.
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import copy
+import json
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from aiohttp import web
+
+LOGIN = "/cma-app-auth/api/login/email-pass-in/v2"
+REFRESH_TOKEN = "/cma-app-auth/api/auth/refresh-token"
+VEHICLES = "/cma-app-user/api/vehicle/vehicles"
+CONDITION = "/cma-app-car-condition/api/vehicle/condition/v2"
+
+# gateway codes
+TOKEN_EXPIRED = "APP_1_1_02_004"
+REFRESH_TOKEN_INVALID = "APP_1_1_02_005"
+INVALID_REQUEST = "APP_1_1_01_001"
+VEHICLE_NOT_FOUND = "APP_1_2_01_002"
+
+RECORDING = Path(__file__).parent / "fixtures" / "condition_v2.json"
+
+FIRST_VEHICLE_ID = 1000
+
+
+def _b64(data: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+
+
+def _merge(base: dict, override: dict) -> dict:
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            _merge(base[key], value)
+        else:
+            base[key] = value
+    return base
+
+
+@dataclass
+class Failure:
+    """Answer replacing the next `times` requests of an endpoint.
+
+    status: HTTP status, 200 answers with success=false and the gateway code
+    vehicle_id: only requests for this vehicle fail
+    """
+    code: str | None = None
+    status: int = 200
+    times: int = 1
+    vehicle_id: int | None = None
+
+
+class FakeGateway:
+    """aiohttp application answering like cma-app-gw.
+
+    vehicles: number of synthetic vehicles of the account
+    latency: seconds every request takes
+    batch: whether condition/v2 accepts a vehicleIds list
+    ignore_criteria: answer with all recorded blocks instead of the requested ones
+    padding: entries added to the departurePlan block, to inflate the payload
+    token_lifetime: seconds until issued tokens expire
+    """
+
+    def __init__(
+            self,
+            vehicles: int = 1,
+            latency: float = 0.0,
+            batch: bool = False,
+            ignore_criteria: bool = False,
+            padding: int = 0,
+            token_lifetime: float = 3600,
+    ):
+        self.vehicles = vehicles
+        self.latency = latency
+        self.batch = batch
+        self.ignore_criteria = ignore_criteria
+        self.padding = padding
+        self.token_lifetime = token_lifetime
+
+        # per vehicle payload changes, merged into the recording
+        self.statuses: dict[int, dict] = {}
+        self.requests: Counter[str] = Counter()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.url = ""
+
+        self._recording: dict = json.loads(RECORDING.read_text())
+        self._failures: dict[str, list[Failure]] = {}
+        self._serial = 0
+        self.token: str | None = None
+        self.refresh: str | None = None
+        self._issue_tokens()
+
+        self.app = web.Application(middlewares=[self._middleware])
+        self.app.router.add_post(LOGIN, self._login)
+        self.app.router.add_post(REFRESH_TOKEN, self._refresh_token)
+        self.app.router.add_post(VEHICLES, self._vehicles)
+        self.app.router.add_post(CONDITION, self._condition)
+
+    @property
+    def vehicle_ids(self) -> list[int]:
+        return [FIRST_VEHICLE_ID + index for index in range(self.vehicles)]
+
+    def fail(
+            self,
+            path: str,
+            code: str | None = None,
+            status: int = 200,
+            times: int = 1,
+            vehicle_id: int | None = None,
+    ) -> None:
+        """Answer the next requests of the endpoint with an error."""
+        self._failures.setdefault(path, []).append(Failure(code, status, times, vehicle_id))
+
+    def expire_token(self) -> None:
+        """Reject the current token, requests get TOKEN_EXPIRED until it is refreshed."""
+        self.token = None
+
+    def payload(self, vehicle_id: int, blocks: set[str] | None = None) -> dict:
+        """condition/v2 data of a vehicle, limited to the given blocks."""
+        data = copy.deepcopy(self._recording)
+        index = vehicle_id - FIRST_VEHICLE_ID
+        # vehicles differ a little, like a real fleet
+        data["vehicleStatus"]["soc"] = 40 + index % 60
+        data["location"]["latitude"] += index * 0.01
+        _merge(data, self.statuses.get(vehicle_id, {}))
+
+        if self.padding:
+            plan = data["departurePlan"]["plans"][0]
+            data["departurePlan"]["plans"] += [
+                {**plan, "planId": plan_id} for plan_id in range(2, self.padding + 2)
+            ]
+
+        if blocks is None or self.ignore_criteria:
+            return data
+        return {block: value for block, value in data.items() if block in blocks}
+
+    def _issue_tokens(self) -> None:
+        self._serial += 1
+        self.token = ".".join((
+            _b64({"alg": "none", "typ": "JWT"}),
+            _b64({"sub": "fake", "jti": self._serial, "exp": int(time.time() + self.token_lifetime)}),
+            "fake",
+        ))
+        self.refresh = f"refresh-{self._serial}"
+
+    def _take_failure(self, path: str, body: dict) -> Failure | None:
+        for failure in self._failures.get(path, ()):
+            if failure.vehicle_id is not None and failure.vehicle_id != body.get("vehicleId"):
+                continue
+
+            failure.times -= 1
+            if failure.times <= 0:
+                self._failures[path].remove(failure)
+            return failure
+
+        return None
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        self.requests[request.path] += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+
+            request["body"] = body = await request.json()
+
+            if (failure := self._take_failure(request.path, body)) is not None:
+                if failure.status != 200:
+                    return web.Response(status=failure.status)
+                return _error(failure.code)
+
+            return await handler(request)
+        finally:
+            self.in_flight -= 1
+
+    def _authorized(self, request: web.Request) -> bool:
+        return self.token is not None and request.headers.get("authorization") == self.token
+
+    async def _login(self, request: web.Request) -> web.Response:
+        self._issue_tokens()
+        return _success({"token": self.token, "refreshToken": self.refresh})
+
+    async def _refresh_token(self, request: web.Request) -> web.Response:
+        # refresh tokens are single use, like the real gateway's
+        if request["body"].get("refreshToken") != self.refresh:
+            return _error(REFRESH_TOKEN_INVALID)
+
+        self._issue_tokens()
+        return _success({"token": self.token, "refreshToken": self.refresh})
+
+    async def _vehicles(self, request: web.Request) -> web.Response:
+        if not self._authorized(request):
+            return _error(TOKEN_EXPIRED)
+
+        return _success([
+            {"vehicleId": vehicle_id, "vin": f"FAKEVIN{vehicle_id:010d}", "modelName": "Mazda 6e"}
+            for vehicle_id in self.vehicle_ids
+        ])
+
+    async def _condition(self, request: web.Request) -> web.Response:
+        if not self._authorized(request):
+            return _error(TOKEN_EXPIRED)
+
+        body = request["body"]
+        blocks = {
+            block for block, requested in (body.get("vechileCriteria") or {}).items()
+            if requested == "1"
+        }
+
+        if "vehicleId" not in body:
+            if not self.batch or not isinstance(body.get("vehicleIds"), list):
+                return _error(INVALID_REQUEST)
+
+            return _success([
+                {"vehicleId": vehicle_id, **self.payload(vehicle_id, blocks)}
+                for vehicle_id in body["vehicleIds"]
+                if vehicle_id in self.vehicle_ids
+            ])
+
+        if body["vehicleId"] not in self.vehicle_ids:
+            return _error(VEHICLE_NOT_FOUND)
+
+        return _success(self.payload(body["vehicleId"], blocks))
+
+
+def _success(data: Any) -> web.Response:
+    return web.json_response({"success": True, "code": "0", "message": "success", "data": data})
+
+
+def _error(code: str | None) -> web.Response:
+    return web.json_response({"success": False, "code": code, "message": "error", "data": None})
@@ -0,0 +1,99 @@
+"""Mazda6EApi against the fake gateway: requests sent, latency and memory."""
+from __future__ import annotations
+
+import gc
+import tracemalloc
+
+import pytest
+
+from custom_components.mazda_6e.api import Mazda6EApi, Mazda6eApiError
+from custom_components.mazda_6e.models import VehicleStatus
+
+from .fake_gateway import CONDITION, INVALID_REQUEST, LOGIN, VEHICLES, FakeGateway
+
+
+async def test_login(gateway: FakeGateway, api: Mazda6EApi) -> None:
+    data = await api.login_email_password("email", "password")
+
+    assert data["token"] == api.token == gateway.token
+    assert api.refresh == gateway.refresh
+    assert gateway.requests[LOGIN] == 1
+
+
+async def test_vehicles(gateway: FakeGateway, api: Mazda6EApi) -> None:
+    gateway.vehicles = 15
+
+    vehicles = await api.async_get_vehicles()
+
+    assert [vehicle.vehicle_id for vehicle in vehicles] == gateway.vehicle_ids
+    assert gateway.requests[VEHICLES] == 1
+
+
+async def test_status_of_requested_blocks(gateway: FakeGateway, api: Mazda6EApi) -> None:
+    status = await api.async_get_vehicle_status(gateway.vehicle_ids[0], {"vehicleStatus", "charge"})
+
+    assert set(status) == {"vehicleStatus", "charge"}
+    assert gateway.requests[CONDITION] == 1
+
+
+async def test_gateway_error(gateway: FakeGateway, api: Mazda6EApi) -> None:
+    gateway.fail(CONDITION, code=INVALID_REQUEST)
+
+    with pytest.raises(Mazda6eApiError) as err:
+        await api.async_get_vehicle_status(gateway.vehicle_ids[0])
+
+    assert err.value.code == INVALID_REQUEST
+    assert api.metrics.retries == 0
+
+
+async def test_server_errors_are_retried(
+        gateway: FakeGateway, api: Mazda6EApi, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr("custom_components.mazda_6e.api.RETRY_BACKOFF", 0.01)
+    gateway.fail(CONDITION, status=503, times=2)
+
+    await api.async_get_vehicle_status(gateway.vehicle_ids[0])
+
+    assert gateway.requests[CONDITION] == 3
+    assert api.metrics.retries == 2
+    assert api.metrics.endpoints[CONDITION].errors == 2
+
+
+@pytest.mark.parametrize("latency", [0.0, 0.05, 0.2])
+async def test_latency(
+        gateway: FakeGateway, api: Mazda6EApi, record_property, latency: float
+) -> None:
+    gateway.latency = latency
+
+    for _ in range(5):
+        await api.async_get_vehicle_status(gateway.vehicle_ids[0])
+
+    histogram = api.metrics.endpoints[CONDITION].latency
+    record_property("latency_mean", histogram.mean)
+    record_property("latency_max", histogram.max)
+
+    assert histogram.count == 5
+    assert latency <= histogram.mean < latency + 0.5
+
+
+async def test_memory_per_vehicle(gateway: FakeGateway, api: Mazda6EApi, record_property) -> None:
+    gateway.vehicles = 50
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        statuses = [
+            VehicleStatus.from_dict(await api.async_get_vehicle_status(vehicle_id))
+            for vehicle_id in gateway.vehicle_ids
+        ]
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    per_vehicle = retained / len(statuses)
+    record_property("retained_bytes_per_vehicle", round(per_vehicle))
+
+    # the raw payloads are dropped once they are parsed
+    assert per_vehicle < 16 * 1024
@@ -0,0 +1,66 @@
+"""Benchmark: refresh wall time of the coordinator as the number of vehicles grows."""
+from __future__ import annotations
+
+import math
+import time
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.mazda_6e.coordinator import Mazda6eCoordinator
+
+from .fake_gateway import CONDITION, FakeGateway
+
+LATENCY = 0.1
+
+
+@pytest.mark.parametrize("concurrency", [1, 4])
+@pytest.mark.parametrize("vehicles", [1, 5, 15, 30])
+async def test_refresh_wall_time(
+        gateway: FakeGateway,
+        coordinator: Mazda6eCoordinator,
+        record_property,
+        vehicles: int,
+        concurrency: int,
+) -> None:
+    gateway.vehicles = vehicles
+    gateway.latency = LATENCY
+    coordinator.max_concurrent_requests = concurrency
+
+    started = time.perf_counter()
+    await coordinator.async_refresh()
+    wall_time = time.perf_counter() - started
+
+    # vehicle list and batch probe, then the status requests in rounds of `concurrency`
+    sequential = 1 + (vehicles > 1)
+    expected = (sequential + math.ceil(vehicles / concurrency)) * LATENCY
+    record_property("wall_time", round(wall_time, 3))
+    record_property("serial_wall_time", round((sequential + vehicles) * LATENCY, 3))
+
+    assert coordinator.last_update_success
+    assert len(coordinator.data) == vehicles
+    assert gateway.max_in_flight <= concurrency
+    assert wall_time < expected + 0.5
+
+
+async def test_failing_vehicle_keeps_its_last_data(
+        gateway: FakeGateway,
+        coordinator: Mazda6eCoordinator,
+) -> None:
+    # the failure is final right away, no retries to wait for
+    coordinator.api.request_retries = 0
+    gateway.vehicles = 3
+    await coordinator.async_refresh()
+
+    failing, *others = gateway.vehicle_ids
+    previous = coordinator.data
+    gateway.fail(CONDITION, status=504, times=10, vehicle_id=failing)
+
+    # every vehicle is due again
+    with patch.object(coordinator.scheduler, "is_due", return_value=True):
+        await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator.data[failing] is previous[failing]
+    for vehicle_id in others:
+        assert coordinator.data[vehicle_id]["fetched"] != previous[vehicle_id]["fetched"]
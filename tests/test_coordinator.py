@@ -0,0 +1,105 @@
+"""Mazda6eCoordinator refreshes against the fake gateway: requests, duration and memory."""
+from __future__ import annotations
+
+import gc
+import tracemalloc
+from unittest.mock import patch
+
+from custom_components.mazda_6e.const import ALWAYS_REQUESTED_BLOCKS
+from custom_components.mazda_6e.coordinator import Mazda6eCoordinator
+
+from .fake_gateway import CONDITION, VEHICLES, FakeGateway
+
+
+async def test_first_refresh(gateway: FakeGateway, coordinator: Mazda6eCoordinator) -> None:
+    gateway.vehicles = 5
+
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert set(coordinator.data) == set(gateway.vehicle_ids)
+    assert gateway.requests[VEHICLES] == 1
+    # the rejected batch probe, then one request per vehicle
+    assert gateway.requests[CONDITION] == 1 + 5
+    assert coordinator.api.batch_status_supported is False
+
+
+async def test_batched_refresh(gateway: FakeGateway, coordinator: Mazda6eCoordinator) -> None:
+    gateway.vehicles = 5
+    gateway.batch = True
+
+    await coordinator.async_refresh()
+
+    assert set(coordinator.data) == set(gateway.vehicle_ids)
+    assert gateway.requests[CONDITION] == 1
+    assert coordinator.api.batch_status_supported is True
+
+
+async def test_vehicles_not_due_are_not_fetched(
+        gateway: FakeGateway, coordinator: Mazda6eCoordinator
+) -> None:
+    gateway.vehicles = 3
+    await coordinator.async_refresh()
+    requests = gateway.requests.total()
+
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert gateway.requests.total() == requests
+
+
+async def test_vehicle_without_enabled_entities(
+        gateway: FakeGateway, coordinator: Mazda6eCoordinator
+) -> None:
+    gateway.vehicles = 1
+    await coordinator.async_refresh()
+    vehicle_id = gateway.vehicle_ids[0]
+    previous = coordinator.data[vehicle_id]["fetched"]
+
+    # entities set up, but none of them enabled
+    coordinator.async_register_vehicle(vehicle_id)
+    with patch.object(coordinator.scheduler, "is_due", return_value=True):
+        await coordinator.async_refresh()
+
+    fetched = coordinator.data[vehicle_id]["fetched"]
+    assert {block for block, at in fetched.items() if at != previous[block]} == set(ALWAYS_REQUESTED_BLOCKS)
+
+
+async def test_refresh_duration(
+        gateway: FakeGateway, coordinator: Mazda6eCoordinator, record_property
+) -> None:
+    gateway.vehicles = 8
+    gateway.latency = 0.05
+
+    await coordinator.async_refresh()
+
+    metrics = coordinator.api.metrics
+    record_property("refresh_duration", metrics.refresh_duration.last)
+    record_property("requests", gateway.requests.total())
+    record_property("max_concurrent_requests", gateway.max_in_flight)
+
+    assert coordinator.last_update_success
+    assert metrics.refresh_duration.count == 1
+    assert gateway.max_in_flight <= coordinator.max_concurrent_requests
+
+
+async def test_memory_per_vehicle(
+        gateway: FakeGateway, coordinator: Mazda6eCoordinator, record_property
+) -> None:
+    gateway.vehicles = 50
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        await coordinator.async_refresh()
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    per_vehicle = retained / gateway.vehicles
+    record_property("retained_bytes_per_vehicle", round(per_vehicle))
+
+    assert len(coordinator.data) == gateway.vehicles
+    assert per_vehicle < 32 * 1024
@@ -0,0 +1,96 @@
+"""Response decoding: size limit, pruning and a benchmark on large recorded payloads."""
+from __future__ import annotations
+
+import gc
+import json
+import timeit
+import tracemalloc
+
+import pytest
+from homeassistant.util.json import json_loads_object
+
+from custom_components.mazda_6e.api import (
+    STATUS_BLOCKS,
+    Mazda6EApi,
+    Mazda6eApiError,
+    Mazda6eRetryableError,
+    _prune,
+)
+
+from .fake_gateway import CONDITION, FIRST_VEHICLE_ID, FakeGateway
+
+# departurePlan entries added to the recorded payload, about 200 kB
+PADDING = 2000
+ITERATIONS = 50
+
+
+def _large_response() -> bytes:
+    payload = FakeGateway(padding=PADDING).payload(FIRST_VEHICLE_ID)
+    return json.dumps({"success": True, "code": "0", "data": payload}).encode()
+
+
+async def test_oversized_response_is_rejected(gateway: FakeGateway, api: Mazda6EApi) -> None:
+    gateway.ignore_criteria = True
+    gateway.padding = PADDING
+    api.max_response_size = 64 * 1024
+
+    with pytest.raises(Mazda6eApiError) as err:
+        await api.async_get_vehicle_status(gateway.vehicle_ids[0])
+
+    # not retried, the answer would not get smaller
+    assert not isinstance(err.value, Mazda6eRetryableError)
+    assert gateway.requests[CONDITION] == 1
+
+
+async def test_unrequested_blocks_are_pruned(
+        gateway: FakeGateway, api: Mazda6EApi, record_property
+) -> None:
+    gateway.ignore_criteria = True
+    gateway.padding = PADDING
+
+    status = await api.async_get_vehicle_status(gateway.vehicle_ids[0], {"vehicleStatus", "charge"})
+
+    record_property("bytes_received", api.metrics.bytes_received)
+
+    assert set(status) == {"vehicleStatus", "charge"}
+    assert api.metrics.bytes_received > PADDING * 50
+
+
+def test_decode_benchmark(record_property) -> None:
+    body = _large_response()
+
+    stdlib = timeit.timeit(lambda: json.loads(body), number=ITERATIONS) / ITERATIONS
+    fast = timeit.timeit(lambda: json_loads_object(body), number=ITERATIONS) / ITERATIONS
+
+    record_property("payload_bytes", len(body))
+    record_property("stdlib_decode_ms", round(stdlib * 1000, 3))
+    record_property("decode_ms", round(fast * 1000, 3))
+
+    assert json_loads_object(body) == json.loads(body)
+    assert fast < stdlib
+
+
+def test_retained_memory_benchmark(record_property) -> None:
+    body = _large_response()
+
+    def retained(decode) -> int:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            data = decode()
+            gc.collect()
+            size = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+
+        assert data
+        return size
+
+    full = retained(lambda: json_loads_object(body)["data"])
+    pruned = retained(lambda: _prune(json_loads_object(body)["data"], set(STATUS_BLOCKS)))
+
+    record_property("retained_bytes_full", full)
+    record_property("retained_bytes_pruned", pruned)
+
+    assert pruned < full / 10
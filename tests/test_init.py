@@ -0,0 +1,48 @@
+"""Setup and unload of config entries that share one Mazda login."""
+from __future__ import annotations
+
+import pytest
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.mazda_6e.const import DOMAIN
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(recorder_mock, enable_custom_integrations):
+    """Start the recorder before hass, the integration depends on it."""
+    yield
+
+
+async def test_entries_of_one_login_share_the_entities(
+        hass: HomeAssistant, patch_api: None, config_entry: MockConfigEntry
+) -> None:
+    second = MockConfigEntry(domain=DOMAIN, title="Mazda 6e", data=dict(config_entry.data))
+    second.add_to_hass(hass)
+
+    # sets up every entry of the domain
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    entity_registry = er.async_get(hass)
+    entities = er.async_entries_for_config_entry(entity_registry, config_entry.entry_id)
+
+    assert second.state is ConfigEntryState.LOADED
+    assert entities
+    assert not er.async_entries_for_config_entry(entity_registry, second.entry_id)
+
+    # the second entry is reloaded and takes the entities over
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert second.state is ConfigEntryState.LOADED
+    for entity in entities:
+        assert entity_registry.async_get(entity.entity_id).config_entry_id == second.entry_id
+        if entity.disabled_by is None:
+            assert hass.states.get(entity.entity_id).state != STATE_UNAVAILABLE
+
+    await hass.config_entries.async_unload(second.entry_id)
+    await hass.async_block_till_done()
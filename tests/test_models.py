@@ -0,0 +1,114 @@
+"""VehicleStatus parsing, with a micro-benchmark of parse plus entity reads."""
+from __future__ import annotations
+
+import gc
+import json
+import timeit
+import tracemalloc
+
+from custom_components.mazda_6e.api import STATUS_BLOCKS
+from custom_components.mazda_6e.coordinator import VALUE_DESCRIPTIONS
+from custom_components.mazda_6e.extractors import build_value_table
+from custom_components.mazda_6e.models import ChargeStatus, VehicleStatus
+
+from .fake_gateway import RECORDING
+
+ITERATIONS = 1000
+
+
+def _payload() -> dict:
+    data = json.loads(RECORDING.read_text())
+    return {block: value for block, value in data.items() if block in STATUS_BLOCKS}
+
+
+def test_parse() -> None:
+    status = VehicleStatus.from_dict(_payload())
+
+    assert status.driving.soc == 78
+    assert status.driving.speed == 0
+    assert status.charge.charge_status is ChargeStatus.NOT_CHARGING
+    assert status.tire.left_front == 250
+    # tenths of a degree in the payload
+    assert status.hvac.inside_temp == 21.5
+    assert status.door.doors == (0, 0, 0, 0)
+    assert status.location.latitude == 48.137154
+    assert status.available_blocks() == {
+        "vehicleStatus", "charge", "tire", "seat", "hvac", "door", "window", "location"
+    }
+
+
+def test_parse_only_requested_blocks() -> None:
+    status = VehicleStatus.from_dict(_payload(), {"vehicleStatus", "charge"})
+
+    assert status.available_blocks() == {"vehicleStatus", "charge"}
+    assert status.tire is None
+
+
+def test_merge_keeps_blocks_not_fetched() -> None:
+    previous = VehicleStatus.from_dict(_payload())
+    status = VehicleStatus.from_dict(_payload(), {"vehicleStatus", "charge"}).merge(previous)
+
+    assert status.tire == previous.tire
+    assert status.location == previous.location
+
+
+def test_parse_and_entity_reads_benchmark(record_property) -> None:
+    payload = _payload()
+    keys = [description.key for description in VALUE_DESCRIPTIONS]
+
+    def parse_and_read() -> None:
+        values, _ = build_value_table(VehicleStatus.from_dict(payload), VALUE_DESCRIPTIONS)
+        for key in keys:
+            values.get(key)
+
+    status = VehicleStatus.from_dict(payload)
+
+    def extract_per_read() -> None:
+        # every entity walks the status on its own, as on every state write
+        for description in VALUE_DESCRIPTIONS:
+            description.value.extract(status)
+
+    values, _ = build_value_table(status, VALUE_DESCRIPTIONS)
+
+    def table_reads() -> None:
+        for key in keys:
+            values.get(key)
+
+    parse_and_read_time = timeit.timeit(parse_and_read, number=ITERATIONS) / ITERATIONS
+    extract_time = timeit.timeit(extract_per_read, number=ITERATIONS) / ITERATIONS
+    table_time = timeit.timeit(table_reads, number=ITERATIONS) / ITERATIONS
+
+    record_property("entity_reads", len(keys))
+    record_property("parse_and_read_us", round(parse_and_read_time * 1e6, 1))
+    record_property("extract_reads_us", round(extract_time * 1e6, 1))
+    record_property("table_reads_us", round(table_time * 1e6, 1))
+
+    assert table_time < extract_time
+
+
+def test_memory_per_vehicle(record_property) -> None:
+    vehicles = 100
+    text = RECORDING.read_text()
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        payloads = [
+            {block: value for block, value in json.loads(text).items() if block in STATUS_BLOCKS}
+            for _ in range(vehicles)
+        ]
+        raw = tracemalloc.get_traced_memory()[0] - before
+
+        statuses = [VehicleStatus.from_dict(payload) for payload in payloads]
+        del payloads
+        gc.collect()
+        parsed = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    record_property("raw_bytes_per_vehicle", round(raw / vehicles))
+    record_property("parsed_bytes_per_vehicle", round(parsed / vehicles))
+
+    assert len(statuses) == vehicles
+    assert parsed < raw
@@ -0,0 +1,74 @@
+"""Benchmark: state writes per hour of a parked vehicle, which end up in the recorder."""
+from __future__ import annotations
+
+from collections import Counter
+from unittest.mock import patch
+
+import pytest
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.mazda_6e.const import DOMAIN
+
+from .fake_gateway import FakeGateway
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(recorder_mock, enable_custom_integrations):
+    """Start the recorder before hass, the integration depends on it."""
+    yield
+
+
+async def test_parked_vehicle_state_writes_per_hour(
+        hass: HomeAssistant,
+        gateway: FakeGateway,
+        init_integration: MockConfigEntry,
+        record_property,
+) -> None:
+    coordinator = hass.data[DOMAIN][init_integration.entry_id]
+    vehicle_id = gateway.vehicle_ids[0]
+
+    entity_registry = er.async_get(hass)
+    entities = [
+        entry for entry in er.async_entries_for_config_entry(entity_registry, init_integration.entry_id)
+        if entry.disabled_by is None
+    ]
+    last_update = entity_registry.async_get_entity_id("sensor", DOMAIN, f"{vehicle_id}_last_update")
+
+    writes: Counter[str] = Counter()
+
+    @callback
+    def _count(event: Event) -> None:
+        writes[event.data["entity_id"]] += 1
+
+    notifications = 0
+
+    @callback
+    def _count_notification() -> None:
+        nonlocal notifications
+        notifications += 1
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _count)
+    unsub = coordinator.async_add_listener(_count_notification)
+    refreshes = coordinator.api.metrics.refresh_duration.count
+
+    # one hour of polls at the base interval, a frozen clock would time out the requests
+    with patch.object(coordinator.scheduler, "is_due", return_value=True):
+        for _ in range(int(3600 // coordinator.scheduler.base_interval)):
+            await coordinator.async_refresh()
+            await hass.async_block_till_done()
+
+    unsub()
+
+    # without the diff every entity is written whenever the coordinator notifies them
+    record_property("entities", len(entities))
+    record_property("refreshes_per_hour", coordinator.api.metrics.refresh_duration.count - refreshes)
+    record_property("state_writes_per_hour_without_diff", notifications * len(entities))
+    record_property("state_writes_per_hour", writes.total())
+
+    assert notifications > 0
+    # the values of a parked vehicle do not change, only the fetch time does
+    assert set(writes) <= {last_update}
+    assert writes.total() <= notifications
@@ -0,0 +1,69 @@
+"""Single-flight token refresh of Mazda6EApi under concurrent requests."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.mazda_6e.api import Mazda6EApi
+
+from .fake_gateway import CONDITION, REFRESH_TOKEN, TOKEN_EXPIRED, FakeGateway
+
+
+@pytest.mark.parametrize("requests", [2, 10, 50])
+async def test_expired_token_is_refreshed_once(
+        gateway: FakeGateway, api: Mazda6EApi, requests: int
+) -> None:
+    gateway.vehicles = requests
+    # keeps all requests in flight until the first one sees the expired token
+    gateway.latency = 0.05
+    gateway.expire_token()
+
+    saved = []
+    api.token_update_callback = lambda token, refresh: saved.append((token, refresh))
+
+    statuses = await asyncio.gather(
+        *(api.async_get_vehicle_status(vehicle_id) for vehicle_id in gateway.vehicle_ids)
+    )
+
+    assert all(statuses)
+    assert gateway.requests[REFRESH_TOKEN] == 1
+    assert api.metrics.token_refreshes == 1
+    assert saved == [(gateway.token, gateway.refresh)]
+    # every request was rejected once and sent again with the new token
+    assert gateway.requests[CONDITION] == 2 * requests
+
+
+async def test_concurrent_token_expired_codes(gateway: FakeGateway, api: Mazda6EApi) -> None:
+    requests = 10
+    gateway.vehicles = requests
+    gateway.latency = 0.05
+    gateway.fail(CONDITION, code=TOKEN_EXPIRED, times=requests)
+
+    await asyncio.gather(
+        *(api.async_get_vehicle_status(vehicle_id) for vehicle_id in gateway.vehicle_ids)
+    )
+
+    # a second refresh would have used the refresh token rotated by the first one
+    assert gateway.requests[REFRESH_TOKEN] == 1
+    assert api.token == gateway.token
+
+
+async def test_expiring_token_is_refreshed_before_the_requests(
+        gateway: FakeGateway, api: Mazda6EApi
+) -> None:
+    requests = 10
+    gateway.vehicles = requests
+    gateway.latency = 0.05
+    # issued tokens expire within the refresh margin
+    gateway.token_lifetime = 60
+    await api.login_email_password("email", "password")
+    gateway.token_lifetime = 3600
+
+    await asyncio.gather(
+        *(api.async_get_vehicle_status(vehicle_id) for vehicle_id in gateway.vehicle_ids)
+    )
+
+    assert gateway.requests[REFRESH_TOKEN] == 1
+    # none of the requests was rejected and sent again
+    assert gateway.requests[CONDITION] == requests